@@ -0,0 +1,150 @@
+"""Alarm control panel for the Comfort security mode."""
+
+from homeassistant.components.alarm_control_panel import (
+    AlarmControlPanelEntity,
+    AlarmControlPanelEntityFeature,
+    AlarmControlPanelState,
+    CodeFormat,
+)
+from homeassistant.core import callback
+from homeassistant.exceptions import HomeAssistantError, ServiceValidationError
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
+from homeassistant.helpers.event import async_call_later
+
+from .client import ComfortError
+from .const import CONF_CODELESS_DISARM, DOMAIN, SIGNAL_SECURITY
+from .entity import ComfortEntity
+
+MODE_STATES = {
+    0: AlarmControlPanelState.DISARMED,
+    1: AlarmControlPanelState.ARMED_AWAY,
+    2: AlarmControlPanelState.ARMED_NIGHT,
+    3: AlarmControlPanelState.ARMED_HOME,
+    4: AlarmControlPanelState.ARMED_VACATION,
+}
+
+
+async def async_setup_entry(hass, entry, async_add_entities) -> None:  # noqa: ANN001
+    """Set up the alarm control panel."""
+    async_add_entities(
+        [
+            ComfortAlarmPanel(
+                hass.data[DOMAIN][entry.entry_id],
+                codeless_disarm=entry.options.get(CONF_CODELESS_DISARM, False),
+            )
+        ]
+    )
+
+
+class ComfortAlarmPanel(ComfortEntity, AlarmControlPanelEntity):
+    """
+    Security mode, alarms and entry/exit delays of the panel.
+
+    Arming without a code uses the configured PIN; disarming needs a user
+    code unless codeless disarm is turned on in the options.
+    """
+
+    _attr_name = None
+    _attr_code_arm_required = False
+    _attr_supported_features = (
+        AlarmControlPanelEntityFeature.ARM_AWAY
+        | AlarmControlPanelEntityFeature.ARM_NIGHT
+        | AlarmControlPanelEntityFeature.ARM_HOME
+        | AlarmControlPanelEntityFeature.ARM_VACATION
+    )
+
+    def __init__(self, client, *, codeless_disarm: bool = False) -> None:  # noqa: ANN001, D107
+        super().__init__(client)
+        self._attr_unique_id = f"{client.entry_id}_alarm"
+        self._codeless_disarm = codeless_disarm
+        self._attr_code_format = None if codeless_disarm else CodeFormat.NUMBER
+        self._cancel_refresh = None
+
+    async def async_added_to_hass(self) -> None:
+        """Follow mode, alarm and delay reports."""
+        await super().async_added_to_hass()
+        self.async_on_remove(
+            async_dispatcher_connect(
+                self.hass,
+                SIGNAL_SECURITY.format(self._client.entry_id),
+                self._handle_security,
+            )
+        )
+        self.async_on_remove(self._cancel_delay_refresh)
+        self._schedule_delay_refresh()
+
+    @property
+    def alarm_state(self) -> AlarmControlPanelState | None:
+        """Return triggered, a running delay, or the security mode."""
+        client = self._client
+        now = self.hass.loop.time()
+        if client.alarm_type or client.alarm_triggered:
+            return AlarmControlPanelState.TRIGGERED
+        if client.entry_delay_until is not None and client.entry_delay_until > now:
+            return AlarmControlPanelState.PENDING
+        if client.exit_delay_until is not None and client.exit_delay_until > now:
+            return AlarmControlPanelState.ARMING
+        return MODE_STATES.get(client.mode)
+
+    @property
+    def extra_state_attributes(self) -> dict:
+        """Return the last system alarm reported by the panel."""
+        return {"last_alarm": self._client.last_alarm}
+
+    @callback
+    def _handle_security(self) -> None:
+        self._schedule_delay_refresh()
+        self.async_write_ha_state()
+
+    def _schedule_delay_refresh(self) -> None:
+        """Refresh the state when the latest entry or exit delay runs out."""
+        self._cancel_delay_refresh()
+        ends = [
+            until
+            for until in (self._client.entry_delay_until, self._client.exit_delay_until)
+            if until is not None
+        ]
+        delay = max(ends, default=0) - self.hass.loop.time()
+        if delay > 0:
+            self._cancel_refresh = async_call_later(self.hass, delay, self._refresh)
+
+    @callback
+    def _cancel_delay_refresh(self) -> None:
+        if self._cancel_refresh is not None:
+            self._cancel_refresh()
+            self._cancel_refresh = None
+
+    @callback
+    def _refresh(self, _now) -> None:  # noqa: ANN001
+        self._cancel_refresh = None
+        self._schedule_delay_refresh()
+        self.async_write_ha_state()
+
+    async def async_alarm_disarm(self, code: str | None = None) -> None:
+        """Disarm the panel."""
+        await self._set_mode(0, code)
+
+    async def async_alarm_arm_away(self, code: str | None = None) -> None:
+        """Arm in away mode."""
+        await self._set_mode(1, code)
+
+    async def async_alarm_arm_night(self, code: str | None = None) -> None:
+        """Arm in night mode."""
+        await self._set_mode(2, code)
+
+    async def async_alarm_arm_home(self, code: str | None = None) -> None:
+        """Arm in day mode."""
+        await self._set_mode(3, code)
+
+    async def async_alarm_arm_vacation(self, code: str | None = None) -> None:
+        """Arm in vacation mode."""
+        await self._set_mode(4, code)
+
+    async def _set_mode(self, mode: int, code: str | None) -> None:
+        if not mode and not code and not self._codeless_disarm:
+            msg = "A user code is required to disarm"
+            raise ServiceValidationError(msg)
+        try:
+            await self._client.set_security_mode(mode, code)
+        except ComfortError as err:
+            raise HomeAssistantError(str(err)) from err
@@ -1,45 +1,59 @@
 from homeassistant.components.binary_sensor import BinarySensorEntity  # noqa: D100
-from homeassistant.const import CONF_HOST
 from homeassistant.core import callback
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
 
-from custom_components.comfort.archive import binary_sensor
-
-from .const import EVENT_MESSAGE
+from .const import DOMAIN, SIGNAL_ZONE, SIGNAL_ZONE_COUNT
+from .entity import ComfortEntity
 
 
 async def async_setup_entry(hass, entry, async_add_entities) -> None:  # noqa: ANN001
-    """Set up input sensors."""
-    host = entry.data[CONF_HOST]
-    sensor = ComfortInputSensor(entry.entry_id, host)
-    async_add_entities([binary_sensor])
+    """Set up one binary sensor per zone input."""
+    client = hass.data[DOMAIN][entry.entry_id]
+    sensors: list[ComfortInputSensor] = []
 
-    # Listen for incoming message updates
+    # The panel only tells us how many inputs it has once it reports them,
+    # so entities are added as new zone numbers appear.
     @callback
-    def handle_message_event(event) -> None:  # noqa: ANN001
-        data = event.data
-        if data.get("entry_id") == entry.entry_id:
-            sensor.update_message(data.get("message"))
-
-    hass.bus.async_listen(f"{EVENT_MESSAGE}_update", handle_message_event)
-
-
-class ComfortInputSensor(SensorEntity):
-    """Sensor showing the state of an input."""
-
-    _attr_name = "State of Input"
-    _attr_icon = "mdi:message-text-outline"
-
-    def __init__(self, entry_id, host):  # noqa: ANN001, ANN204, D107
-        self._attr_unique_id = f"{entry_id}_Input"
-        # self._attr_extra_state_attributes = {"host": host}
-        self._state = None
-
-    @property
-    def state(self):  # noqa: ANN201, D102
-        return self._state
+    def add_new_zones() -> None:
+        new = [
+            ComfortInputSensor(client, zone)
+            for zone in range(len(sensors) + 1, client.zone_count + 1)
+        ]
+        if new:
+            sensors.extend(new)
+            async_add_entities(new)
+
+    add_new_zones()
+    entry.async_on_unload(
+        async_dispatcher_connect(
+            hass, SIGNAL_ZONE_COUNT.format(entry.entry_id), add_new_zones
+        )
+    )
+
+
+class ComfortInputSensor(ComfortEntity, BinarySensorEntity):
+    """Binary sensor showing the state of a zone input."""
+
+    def __init__(self, client, zone: int):  # noqa: ANN001, ANN204, D107
+        super().__init__(client)
+        self._zone = zone
+        self._attr_name = f"Input {zone}"
+        self._attr_unique_id = f"{client.entry_id}_input_{zone}"
+
+    async def async_added_to_hass(self) -> None:
+        """Take the current zone state and follow changes to this zone."""
+        await super().async_added_to_hass()
+        self._attr_is_on = self._client.zone_state(self._zone)
+        self.async_on_remove(
+            async_dispatcher_connect(
+                self.hass,
+                SIGNAL_ZONE.format(self._client.entry_id, self._zone),
+                self.update_state,
+            )
+        )
 
     @callback
-    def update_message(self, msg: str):  # noqa: ANN201
-        """Update sensor state when new message arrives."""
-        self._state = msg
+    def update_state(self, is_on: bool) -> None:  # noqa: FBT001
+        """Write the new state; the client only signals real transitions."""
+        self._attr_is_on = is_on
         self.async_write_ha_state()
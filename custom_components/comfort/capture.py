@@ -0,0 +1,120 @@
+"""
+Raw traffic capture for the TCP client.
+
+Records are appended to a rotating binary file by a writer thread, so the
+event loop only packs a header and puts the record on a queue.
+"""
+
+from __future__ import annotations
+
+import logging
+import queue
+import struct
+import threading
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+_LOGGER = logging.getLogger(__name__)
+
+MAGIC = b"COMFCAP1"
+# Each record: wall clock time, direction, payload length, then the payload.
+RECORD = struct.Struct("<dBI")
+INBOUND = 0
+OUTBOUND = 1
+
+DEFAULT_MAX_BYTES = 10_000_000
+DEFAULT_BACKUP_COUNT = 5
+
+
+class FrameCapture:
+    """Append timestamped raw bytes in both directions to a rotating file."""
+
+    def __init__(
+        self,
+        path: str | Path,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        backup_count: int = DEFAULT_BACKUP_COUNT,
+    ) -> None:
+        """Start the writer thread; the file is opened by the thread."""
+        self.path = Path(path)
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self._queue: queue.SimpleQueue[bytes | None] = queue.SimpleQueue()
+        # Set by the writer thread when it gives up, so records stop piling up.
+        self.failed = False
+        self._thread = threading.Thread(
+            target=self._run, name=f"comfort capture {self.path.name}", daemon=True
+        )
+        self._thread.start()
+
+    def record(self, direction: int, data: bytes) -> None:
+        """Queue one chunk of traffic; safe to call from the event loop."""
+        if self.failed:
+            return
+        self._queue.put(RECORD.pack(time.time(), direction, len(data)) + data)
+
+    def close(self) -> None:
+        """Flush queued records and stop the writer thread; blocks until done."""
+        self._queue.put(None)
+        self._thread.join()
+
+    def _run(self) -> None:
+        """Write records until close(), rotating when the file gets too big."""
+        file = None
+        try:
+            file = self._open()
+            while (record := self._queue.get()) is not None:
+                if file.tell() + len(record) > self.max_bytes:
+                    file.close()
+                    self._rotate()
+                    file = self._open()
+                file.write(record)
+                if self._queue.empty():
+                    file.flush()
+        except OSError:
+            self.failed = True
+            _LOGGER.exception("Traffic capture to %s stopped", self.path)
+            # Free anything queued before record() saw the flag.
+            while not self._queue.empty():
+                self._queue.get_nowait()
+        finally:
+            if file is not None:
+                file.close()
+
+    def _open(self):  # noqa: ANN202
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        file = self.path.open("ab")
+        if not file.tell():
+            file.write(MAGIC)
+        return file
+
+    def _rotate(self) -> None:
+        """Shift path.1 .. path.N up by one, dropping the oldest."""
+        for index in range(self.backup_count - 1, 0, -1):
+            source = self.path.with_name(f"{self.path.name}.{index}")
+            if source.exists():
+                source.replace(self.path.with_name(f"{self.path.name}.{index + 1}"))
+        if self.backup_count:
+            self.path.replace(self.path.with_name(f"{self.path.name}.1"))
+        else:
+            self.path.unlink()
+
+
+def read_capture(path: str | Path) -> Iterator[tuple[float, int, bytes]]:
+    """Yield (time, direction, data) for every record in one capture file."""
+    with Path(path).open("rb") as file:
+        if file.read(len(MAGIC)) != MAGIC:
+            msg = f"{path} is not a Comfort capture file"
+            raise ValueError(msg)
+        while header := file.read(RECORD.size):
+            if len(header) < RECORD.size:
+                return
+            timestamp, direction, length = RECORD.unpack(header)
+            data = file.read(length)
+            if len(data) < length:
+                return
+            yield timestamp, direction, data
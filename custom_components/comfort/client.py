@@ -0,0 +1,808 @@
+"""Persistent TCP client for the Comfort panel."""
+
+import asyncio
+import itertools
+import logging
+import random
+import time
+from collections import deque
+from collections.abc import Iterable, Sequence
+from enum import StrEnum
+from typing import TYPE_CHECKING
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers.dispatcher import async_dispatcher_send
+from homeassistant.helpers.event import async_call_later
+from homeassistant.helpers.storage import Store
+
+from .capture import (
+    DEFAULT_BACKUP_COUNT,
+    DEFAULT_MAX_BYTES,
+    INBOUND,
+    OUTBOUND,
+    FrameCapture,
+)
+from .const import (
+    DEFAULT_BUFFER_SIZE,
+    DEFAULT_EVENT_CODES,
+    DEFAULT_KEEPALIVE,
+    DEFAULT_RETRY_INTERVAL,
+    DEFAULT_TIMEOUT,
+    DOMAIN,
+    EVENT_MESSAGE,
+    MAX_QUEUED_FRAMES,
+    MAX_RETRY_INTERVAL,
+    SIGNAL_AVAILABLE,
+    SIGNAL_COUNTER,
+    SIGNAL_FRAME,
+    SIGNAL_OUTPUT,
+    SIGNAL_OUTPUT_COUNT,
+    SIGNAL_SECURITY,
+    SIGNAL_SENSOR,
+    SIGNAL_ZONE,
+    SIGNAL_ZONE_COUNT,
+    STATE_SAVE_DELAY,
+    STORAGE_KEY,
+    STORAGE_VERSION,
+)
+from .framelog import FrameLogger
+from .metrics import ClientMetrics
+from .protocol import (
+    ENTRY_DELAY,
+    ERROR_CODE,
+    EXIT_DELAY,
+    SECURITY_MODES,
+    AlarmTypeReport,
+    ArmReadyReport,
+    ComfortMessage,
+    CounterReport,
+    EntryExitReport,
+    FrameBuffer,
+    InputReport,
+    LoginReport,
+    OutputReport,
+    OutputStatesReport,
+    SecurityModeReport,
+    SensorReport,
+    SystemAlarmReport,
+    ZoneStatesReport,
+    changed_bits,
+    decode,
+    encode,
+    is_command,
+    iter_bits,
+    priority,
+    redact,
+    reply_codes,
+)
+
+if TYPE_CHECKING:
+    from .proxy import ComfortProxy
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class ComfortError(HomeAssistantError):
+    """Base error for talking to the Comfort panel."""
+
+
+class ComfortCommandError(ComfortError):
+    """The panel rejected a command."""
+
+    # The NA or ER frame the panel rejected it with, if any.
+    reply: ComfortMessage | None = None
+
+
+class ComfortTimeoutError(ComfortError):
+    """The panel did not reply to a command in time."""
+
+
+def _ignore_result(future: asyncio.Future) -> None:
+    """Retrieve a reply nobody waits for, so asyncio doesn't log it."""
+    if not future.cancelled():
+        future.exception()
+
+
+class ConnectionState(StrEnum):
+    """Lifecycle of the panel session, owned by the supervisor task."""
+
+    DISCONNECTED = "disconnected"
+    CONNECTING = "connecting"
+    AUTHENTICATING = "authenticating"
+    READY = "ready"
+
+
+class TCPClient:
+    """Persistent TCP connection with listener, reconnect, and event firing."""
+
+    def __init__(  # noqa: ANN204, D107, PLR0913
+        self,
+        hass: HomeAssistant,
+        host: str,
+        port: int,
+        pin: str,
+        entry_id: str,
+        *,
+        buffer_size: int = DEFAULT_BUFFER_SIZE,
+        timeout: float = DEFAULT_TIMEOUT,
+        retry_interval: float = DEFAULT_RETRY_INTERVAL,
+        keepalive: float = DEFAULT_KEEPALIVE,
+        event_codes: Iterable[str] = DEFAULT_EVENT_CODES,
+    ):
+        self.hass = hass
+        self.host = host
+        self.port = int(port)
+        self.pin = pin
+        self.entry_id = entry_id
+        self.buffer_size = int(buffer_size)
+        self.timeout = timeout
+        self.retry_interval = retry_interval
+        self.keepalive = keepalive
+        # Codes fired on the event bus; everything else is only dispatched.
+        self.event_codes = frozenset(event_codes)
+        self.heartbeat_rtt: float | None = None
+        self._last_received = 0.0
+        self._heartbeat_task: asyncio.Task | None = None
+        self.state = ConnectionState.DISCONNECTED
+        self.reader = None
+        self.writer = None
+        self.listener_task = None
+        self._supervisor: asyncio.Task | None = None
+        # Counters and sensors to read in the initial snapshot.
+        self.counters: tuple[int, ...] = ()
+        self.sensors: tuple[int, ...] = ()
+        self._stopping = False
+        self.frame_log = FrameLogger(_LOGGER)
+        self.metrics = ClientMetrics()
+        self.capture: FrameCapture | None = None
+        # Local proxy sharing this session; it gets every frame not
+        # consumed as a reply.
+        self.proxy: ComfortProxy | None = None
+        # Commands awaiting a reply, oldest first, with the codes that answer them.
+        self._pending: deque[tuple[tuple[str, ...], asyncio.Future]] = deque()
+        # Outbound frames as (priority, sequence, command, frame, pending entry);
+        # the sequence keeps equal priorities in the order they were queued.
+        self._outbound: asyncio.PriorityQueue = asyncio.PriorityQueue(MAX_QUEUED_FRAMES)
+        self._sequence = itertools.count()
+        self._writer_task: asyncio.Task | None = None
+        # Zone and output states are bitmasks; bit n - 1 is zone/output n.
+        self.zone_bits = 0
+        self.zone_count = 0
+        self.output_bits = 0
+        self.output_count = 0
+        self.mode: int | None = None
+        # Current AL alarm type (0 for none), the last AM system alarm and
+        # whether an AM alarm has triggered the system, and the loop times at
+        # which a running entry or exit delay ends.
+        self.alarm_type = 0
+        self.last_alarm: str | None = None
+        self.alarm_triggered = False
+        self.entry_delay_until: float | None = None
+        self.exit_delay_until: float | None = None
+        self.counter_values: dict[int, int] = {}
+        self.sensor_values: dict[int, int] = {}
+        self.last_message: str | None = None
+        # Last known state is kept across restarts and served until the first
+        # session either goes live or fails.
+        self._store: Store = Store(hass, STORAGE_VERSION, STORAGE_KEY.format(entry_id))
+        self._save_unsub = None
+        self._from_cache = False
+
+    def zone_state(self, zone: int) -> bool | None:
+        """Return whether a zone input is active, or None if not reported yet."""
+        if zone > self.zone_count:
+            return None
+        return bool(self.zone_bits >> (zone - 1) & 1)
+
+    def output_state(self, output: int) -> bool | None:
+        """Return whether an output is on, or None if not reported yet."""
+        if output > self.output_count:
+            return None
+        return bool(self.output_bits >> (output - 1) & 1)
+
+    @property
+    def available(self) -> bool:
+        """Return whether the panel session is usable, or cached state is fresh."""
+        return self.state is ConnectionState.READY or self._from_cache
+
+    def _set_state(self, state: ConnectionState) -> None:
+        if state is self.state:
+            return
+        _LOGGER.debug("Connection state %s -> %s", self.state, state)
+        was_available = self.available
+        if state is ConnectionState.READY:
+            self.metrics.connection_ready()
+        elif self.state is ConnectionState.READY:
+            self.metrics.connection_lost()
+        self.state = state
+        if state in (ConnectionState.READY, ConnectionState.DISCONNECTED):
+            self._from_cache = False
+        if self.available != was_available:
+            async_dispatcher_send(
+                self.hass, SIGNAL_AVAILABLE.format(self.entry_id), self.available
+            )
+
+    async def async_restore_state(self) -> None:
+        """Load the last known panel state saved by a previous run."""
+        data = await self._store.async_load()
+        if not data:
+            return
+        self.zone_bits = data["zone_bits"]
+        self.zone_count = data["zone_count"]
+        self.output_bits = data["output_bits"]
+        self.output_count = data["output_count"]
+        self.mode = data["mode"]
+        self.counter_values = {int(k): v for k, v in data["counters"].items()}
+        self.sensor_values = {int(k): v for k, v in data["sensors"].items()}
+        self.last_message = data["last_message"]
+        self._from_cache = True
+
+    @callback
+    def _snapshot(self) -> dict:
+        return {
+            "zone_bits": self.zone_bits,
+            "zone_count": self.zone_count,
+            "output_bits": self.output_bits,
+            "output_count": self.output_count,
+            "mode": self.mode,
+            "counters": self.counter_values,
+            "sensors": self.sensor_values,
+            "last_message": self.last_message,
+        }
+
+    @callback
+    def _schedule_save(self) -> None:
+        """Save state a while after it changes, at most once per delay."""
+        if self._save_unsub is None:
+            self._save_unsub = async_call_later(
+                self.hass, STATE_SAVE_DELAY, self._save_state
+            )
+
+    @callback
+    def _save_state(self, _now: object = None) -> None:
+        self._save_unsub = None
+        self._store.async_delay_save(self._snapshot, 0)
+
+    def start(self) -> None:
+        """Start connecting in the background; entities stay unavailable until ready."""
+        if self._supervisor is None:
+            self._supervisor = self.hass.async_create_background_task(
+                self._supervise(), f"{DOMAIN} {self.host} supervisor"
+            )
+
+    async def _supervise(self) -> None:
+        """Own the connection: connect, log in, listen, back off and repeat."""
+        failures = 0
+        while not self._stopping:
+            try:
+                await self._run_session()
+            except (OSError, ComfortError) as err:
+                _LOGGER.warning(
+                    "Connection to %s:%s failed: %s", self.host, self.port, err
+                )
+            except Exception:
+                _LOGGER.exception("Unexpected error in Comfort connection")
+            finally:
+                reached_ready = self.state is ConnectionState.READY
+                await self._close()
+            if self._stopping:
+                break
+            failures = 0 if reached_ready else failures + 1
+            delay = self._backoff(failures)
+            _LOGGER.info("Reconnecting in %.1f seconds", delay)
+            await asyncio.sleep(delay)
+
+    def _backoff(self, failures: int) -> float:
+        """Return the retry delay: exponential in failures, capped, with jitter."""
+        ceiling = min(self.retry_interval * 2**failures, MAX_RETRY_INTERVAL)
+        return random.uniform(self.retry_interval / 2, ceiling)  # noqa: S311
+
+    async def _run_session(self) -> None:
+        """Run one connection until it drops; only the supervisor calls this."""
+        self._set_state(ConnectionState.CONNECTING)
+        _LOGGER.info("Connecting to %s:%s", self.host, self.port)
+        async with asyncio.timeout(self.timeout):
+            self.reader, self.writer = await asyncio.open_connection(
+                self.host, self.port
+            )
+        _LOGGER.info("Connected to %s:%s", self.host, self.port)
+        self._writer_task = asyncio.create_task(self._write_loop())
+        self.listener_task = asyncio.create_task(self._listen())
+
+        self._set_state(ConnectionState.AUTHENTICATING)
+        login = await self.request(f"LI{self.pin}")
+        if not login.user:
+            msg = "Login rejected, check the PIN"
+            raise ComfortError(msg)
+        self._set_state(ConnectionState.READY)
+        if self.keepalive:
+            self._heartbeat_task = asyncio.create_task(self._heartbeat())
+
+        # Queue the whole snapshot in one go so it leaves in a single write;
+        # state is applied from the replies as they stream back.
+        for command in self._snapshot_commands():
+            await self._queue_unawaited(command, encode(command))
+        await self.listener_task
+
+    def _snapshot_commands(self) -> list[str]:
+        """Return the queries that read the panel's full state."""
+        return [
+            "M?",
+            "Z?",
+            "Y?",
+            *(f"C?{counter:02X}" for counter in self.counters),
+            *(f"s?{sensor:02X}" for sensor in self.sensors),
+            "f?00",
+        ]
+
+    async def _close(self) -> None:
+        """Tear down the current connection, whatever state it reached."""
+        self._set_state(ConnectionState.DISCONNECTED)
+        for task in (self.listener_task, self._writer_task, self._heartbeat_task):
+            if task and not task.done():
+                task.cancel()
+        self.listener_task = self._writer_task = self._heartbeat_task = None
+        # Frames queued for this session are stale once it is gone.
+        while not self._outbound.empty():
+            entry = self._outbound.get_nowait()[4]
+            if entry is not None and not entry[1].done():
+                entry[1].set_exception(ComfortError("Connection to the panel was lost"))
+        self._fail_pending(ComfortError("Connection to the panel was lost"))
+        if self.writer:
+            self.writer.close()
+            try:  # noqa: SIM105
+                await self.writer.wait_closed()
+            except Exception:  # noqa: BLE001, S110
+                pass
+        self.reader = self.writer = None
+
+    async def _listen(self) -> None:
+        """Read frames until the connection closes, then return."""
+        # Real frames are short; anything near a read's worth is line noise.
+        frames = FrameBuffer(self.buffer_size // 8)
+        try:
+            while True:
+                # One read can carry many frames, e.g. the state dump after login.
+                data = await self.reader.read(self.buffer_size)  # type: ignore  # noqa: PGH003
+                self._last_received = self.hass.loop.time()
+                self.metrics.bytes_in += len(data)
+                if self.capture is not None:
+                    self.capture.record(INBOUND, data)
+                if not data:
+                    _LOGGER.warning("Connection closed by remote host")
+                    return
+                resyncs = frames.resyncs
+                for msg in frames.feed(data):
+                    self._handle_frame(msg)
+                if frames.resyncs != resyncs:
+                    self.metrics.resyncs += frames.resyncs - resyncs
+                    _LOGGER.debug("Dropped corrupt data from %s", self.host)
+        finally:
+            self._fail_pending(ComfortError("Connection to the panel was lost"))
+
+    async def _heartbeat(self) -> None:
+        """Echo-test a quiet line so a half-open connection is noticed quickly."""
+        loop = self.hass.loop
+        while True:
+            idle = loop.time() - self._last_received
+            if idle < self.keepalive:
+                await asyncio.sleep(self.keepalive - idle)
+                continue
+            sent = loop.time()
+            try:
+                await self.request("cc00", min(self.keepalive, self.timeout))
+            except ComfortTimeoutError:
+                _LOGGER.warning(
+                    "No heartbeat reply from %s:%s, reconnecting", self.host, self.port
+                )
+                # Closing the stream ends the listener, and with it the session.
+                self.writer.close()  # type: ignore  # noqa: PGH003
+                return
+            except ComfortError as err:
+                # An NA meant for another command can land on the heartbeat;
+                # the line is evidently alive, so just try again later.
+                _LOGGER.debug("Heartbeat not answered: %s", err)
+                await asyncio.sleep(self.keepalive)
+                continue
+            self.heartbeat_rtt = loop.time() - sent
+            _LOGGER.debug("Heartbeat round trip %.3f s", self.heartbeat_rtt)
+
+    def _handle_frame(self, msg: str) -> None:
+        """Decode one frame, update state and notify listeners."""
+        started = time.perf_counter()
+        message = decode(msg)
+        self.metrics.decode_time.add(time.perf_counter() - started)
+        if message is None:
+            _LOGGER.debug("Ignoring malformed frame: %r", msg)
+            self.metrics.malformed += 1
+            return
+        self.metrics.frames[message.code] += 1
+        self.frame_log.log("Received", message.code, msg)
+        if msg != self.last_message:
+            # Every state change arrives in a new frame, so this catches them all.
+            self.last_message = msg
+            self._schedule_save()
+        answered = self._resolve_pending(message) if self._pending else False
+        if self.proxy is not None and not answered:
+            self.proxy.broadcast(msg)
+        self._apply_state(message)
+        if message.code in self.event_codes:
+            self.hass.bus.async_fire(
+                EVENT_MESSAGE,
+                {"entry_id": self.entry_id, "code": message.code, "message": msg},
+            )
+        async_dispatcher_send(self.hass, SIGNAL_FRAME.format(self.entry_id), message)
+
+    def _resolve_pending(self, message: ComfortMessage) -> bool:
+        """Complete the oldest command that this message answers, if any."""
+        if message.code == ERROR_CODE:
+            _codes, future = self._pending.popleft()
+            if not future.done():
+                future.set_exception(
+                    self._rejected("Command not acknowledged", message)
+                )
+            return True
+        if isinstance(message, ArmReadyReport) and not message.zone:
+            # Ready to arm is not the answer yet; the MD confirming the mode is.
+            return False
+        for index, (codes, future) in enumerate(self._pending):
+            if message.code in codes:
+                del self._pending[index]
+                if future.done():
+                    return True
+                if isinstance(message, ArmReadyReport) and message.zone:
+                    future.set_exception(
+                        self._rejected(f"Zone {message.zone} is not ready", message)
+                    )
+                else:
+                    future.set_result(message)
+                return True
+        return False
+
+    @staticmethod
+    def _rejected(reason: str, message: ComfortMessage) -> ComfortCommandError:
+        err = ComfortCommandError(reason)
+        err.reply = message
+        return err
+
+    def _fail_pending(self, err: Exception) -> None:
+        while self._pending:
+            _codes, future = self._pending.popleft()
+            if not future.done():
+                future.set_exception(err)
+
+    def _apply_state(self, message: ComfortMessage) -> None:
+        """Update the zone/output bitmasks and signal the items that changed."""
+        if isinstance(message, InputReport):
+            bit = 1 << (message.zone - 1)
+            bits = self.zone_bits | bit if message.state else self.zone_bits & ~bit
+            self._set_zones(bits, max(self.zone_count, message.zone))
+        elif isinstance(message, ZoneStatesReport):
+            self._set_zones(message.bits, message.count)
+        elif isinstance(message, OutputReport):
+            bit = 1 << (message.output - 1)
+            bits = self.output_bits | bit if message.state else self.output_bits & ~bit
+            self._set_outputs(bits, max(self.output_count, message.output))
+        elif isinstance(message, OutputStatesReport):
+            self._set_outputs(message.bits, message.count)
+        elif isinstance(
+            message,
+            SecurityModeReport | AlarmTypeReport | SystemAlarmReport | EntryExitReport,
+        ):
+            self._apply_security(message)
+        elif isinstance(message, CounterReport):
+            if self.counter_values.get(message.counter) != message.value:
+                self.counter_values[message.counter] = message.value
+                async_dispatcher_send(
+                    self.hass,
+                    SIGNAL_COUNTER.format(self.entry_id, message.counter),
+                    message.value,
+                )
+        elif isinstance(message, SensorReport):
+            if self.sensor_values.get(message.sensor) != message.value:
+                self.sensor_values[message.sensor] = message.value
+                async_dispatcher_send(
+                    self.hass,
+                    SIGNAL_SENSOR.format(self.entry_id, message.sensor),
+                    message.value,
+                )
+        elif isinstance(message, LoginReport):
+            _LOGGER.info("User logged in: %s", message.user)
+
+    def _apply_security(self, message: ComfortMessage) -> None:
+        """Track the mode, alarm and delays, and signal the alarm panel."""
+        if isinstance(message, SecurityModeReport):
+            self.mode = message.mode
+            if not message.mode:
+                # Disarming ends any alarm and delay.
+                self.alarm_type = 0
+                self.alarm_triggered = False
+                self.entry_delay_until = self.exit_delay_until = None
+        elif isinstance(message, AlarmTypeReport):
+            self.alarm_type = message.alarm
+            self.entry_delay_until = None
+            if not message.alarm:
+                self.alarm_triggered = False
+        elif isinstance(message, SystemAlarmReport):
+            self.last_alarm = message.name
+            self.alarm_triggered = self.alarm_triggered or message.triggered
+        elif isinstance(message, EntryExitReport):
+            until = self.hass.loop.time() + message.delay
+            if message.type == ENTRY_DELAY:
+                self.entry_delay_until = until
+            elif message.type == EXIT_DELAY:
+                self.exit_delay_until = until
+        async_dispatcher_send(self.hass, SIGNAL_SECURITY.format(self.entry_id))
+
+    def _set_zones(self, bits: int, count: int) -> None:
+        changed = changed_bits(self.zone_bits, self.zone_count, bits, count)
+        grew = count > self.zone_count
+        self.zone_bits, self.zone_count = bits, count
+        if grew:
+            async_dispatcher_send(self.hass, SIGNAL_ZONE_COUNT.format(self.entry_id))
+        for zone in iter_bits(changed):
+            async_dispatcher_send(
+                self.hass,
+                SIGNAL_ZONE.format(self.entry_id, zone),
+                bool(bits >> (zone - 1) & 1),
+            )
+
+    def _set_outputs(self, bits: int, count: int) -> None:
+        changed = changed_bits(self.output_bits, self.output_count, bits, count)
+        grew = count > self.output_count
+        self.output_bits, self.output_count = bits, count
+        if grew:
+            async_dispatcher_send(self.hass, SIGNAL_OUTPUT_COUNT.format(self.entry_id))
+        for output in iter_bits(changed):
+            async_dispatcher_send(
+                self.hass,
+                SIGNAL_OUTPUT.format(self.entry_id, output),
+                bool(bits >> (output - 1) & 1),
+            )
+
+    async def send_message(self, message: str):  # noqa: ANN201
+        """Send a message to the device."""
+        if self.state is not ConnectionState.READY:
+            msg = "Not connected to the panel"
+            raise ComfortError(msg)
+        command, frame = message.lstrip("\x03"), (message + "\n").encode()
+        if is_command(message):
+            await self._queue_unawaited(command, frame)
+        else:
+            # Free text gets no reply, so a slot would take someone else's OK.
+            await self._queue(command, frame)
+
+    async def _queue_unawaited(self, command: str, frame: bytes) -> None:
+        """
+        Queue a command with a reply slot that nobody waits on.
+
+        The slot takes the command's reply, OK or NA in wire order, so it is
+        not matched to another command; it is dropped after the timeout.
+        """
+        future = self.hass.loop.create_future()
+        future.add_done_callback(_ignore_result)
+        entry = (reply_codes(command), future)
+        await self._queue(command, frame, entry)
+        self.hass.loop.call_later(self.timeout, self._expire, entry)
+
+    def _expire(self, entry: tuple[tuple[str, ...], asyncio.Future]) -> None:
+        """Stop waiting for the reply to an unawaited command."""
+        if entry in self._pending:
+            self._pending.remove(entry)
+        entry[1].cancel()
+
+    async def request(
+        self,
+        command: str,
+        timeout: float | None = None,  # noqa: ASYNC109
+    ) -> ComfortMessage:
+        """
+        Send a command and wait for the panel's reply to it.
+
+        Replies are matched to commands in the order the commands were sent.
+        Raises ComfortCommandError if the panel rejects the command and
+        ComfortTimeoutError if no reply arrives within the configured timeout.
+        """
+        if not self.writer:
+            msg = "Not connected to the panel"
+            raise ComfortError(msg)
+        future = self.hass.loop.create_future()
+        entry = (reply_codes(command), future)
+        sent = self.hass.loop.time()
+        try:
+            async with asyncio.timeout(timeout or self.timeout):
+                await self._queue(command, encode(command), entry)
+                reply = await future
+        except TimeoutError as err:
+            msg = f"No reply to {command[:2]}"
+            raise ComfortTimeoutError(msg) from err
+        finally:
+            if entry in self._pending:
+                self._pending.remove(entry)
+        self.metrics.command_latency.add(self.hass.loop.time() - sent)
+        return reply
+
+    async def request_many(
+        self,
+        commands: Sequence[str],
+        timeout: float | None = None,  # noqa: ASYNC109
+    ) -> list[ComfortMessage | ComfortError]:
+        """
+        Send commands as one pipelined burst and collect the reply to each.
+
+        The commands keep their order on the wire and share one timeout. A
+        command that fails gives its ComfortError in place of a reply, so one
+        rejected command does not hide the replies to the others.
+        """
+        if not commands:
+            return []
+        if not self.writer:
+            msg = "Not connected to the panel"
+            raise ComfortError(msg)
+        # One priority for the whole batch, so the queue can't reorder it.
+        level = min(map(priority, commands))
+        entries = [
+            (reply_codes(command), self.hass.loop.create_future())
+            for command in commands
+        ]
+        sent = self.hass.loop.time()
+        try:
+            async with asyncio.timeout(timeout or self.timeout):
+                for command, entry in zip(commands, entries, strict=True):
+                    await self._queue(command, encode(command), entry, level)
+                await asyncio.wait([future for _codes, future in entries])
+        except TimeoutError:
+            pass
+        finally:
+            for entry in entries:
+                if entry in self._pending:
+                    self._pending.remove(entry)
+        results: list[ComfortMessage | ComfortError] = []
+        for command, (_codes, future) in zip(commands, entries, strict=True):
+            if not future.done():
+                # Cancelled futures are skipped by the writer if still queued.
+                future.cancel()
+                results.append(ComfortTimeoutError(f"No reply to {command[:2]}"))
+            elif (err := future.exception()) is not None:
+                results.append(err)  # type: ignore  # noqa: PGH003
+            else:
+                self.metrics.command_latency.add(self.hass.loop.time() - sent)
+                results.append(future.result())
+        return results
+
+    async def set_security_mode(self, mode: int, code: str | None = None) -> None:
+        """
+        Arm or disarm, overtaking any queued polls, and time the change.
+
+        Uses the configured PIN unless a code is given. Raises
+        ComfortCommandError if the panel refuses, e.g. when a zone is open.
+        """
+        started = self.hass.loop.time()
+        reply = await self.request(f"m!{mode:02X}{code or self.pin}")
+        if isinstance(reply, SecurityModeReport) and reply.mode != mode:
+            msg = f"Panel stayed in {reply.mode_name} mode"
+            raise ComfortCommandError(msg)
+        self.metrics.mode_latency(SECURITY_MODES.get(mode, str(mode))).add(
+            self.hass.loop.time() - started
+        )
+
+    async def set_outputs(
+        self, states: dict[int, bool]
+    ) -> list[ComfortMessage | ComfortError]:
+        """
+        Switch outputs on or off in one pipelined burst.
+
+        Entities are told the new states straight away; the panel's OP and
+        Y? reports confirm them, and any output whose command fails is put
+        back to its last reported state.
+        """
+        for output, state in states.items():
+            async_dispatcher_send(
+                self.hass, SIGNAL_OUTPUT.format(self.entry_id, output), state
+            )
+        try:
+            results = await self.request_many(
+                [f"O!{output:02X}{int(state):02X}" for output, state in states.items()]
+            )
+        except ComfortError:
+            results = None
+        for index, output in enumerate(states):
+            if results is None or isinstance(results[index], Exception):
+                async_dispatcher_send(
+                    self.hass,
+                    SIGNAL_OUTPUT.format(self.entry_id, output),
+                    self.output_state(output),
+                )
+        if results is None:
+            msg = "Not connected to the panel"
+            raise ComfortError(msg)
+        return results
+
+    async def _queue(
+        self,
+        command: str,
+        frame: bytes,
+        entry: tuple[tuple[str, ...], asyncio.Future] | None = None,
+        level: int | None = None,
+    ) -> None:
+        """Queue a frame for the writer task, waiting while the queue is full."""
+        if level is None:
+            level = priority(command)
+        await self._outbound.put((level, next(self._sequence), command, frame, entry))
+
+    async def _write_loop(self) -> None:
+        """Write queued frames, highest priority first, coalescing each batch."""
+        try:
+            while True:
+                batch = [await self._outbound.get()]
+                # Let everything queued in this loop iteration join the batch.
+                await asyncio.sleep(0)
+                while not self._outbound.empty():
+                    batch.append(self._outbound.get_nowait())
+                self.metrics.record_queue_depth(len(batch))
+                frames = []
+                captured = []
+                for _priority, _sequence, command, frame, entry in batch:
+                    if entry is not None:
+                        if entry[1].done():
+                            # The caller gave up waiting; don't send it late.
+                            continue
+                        # Replies arrive in wire order, so track them from here.
+                        self._pending.append(entry)
+                    frames.append(frame)
+                    shown = redact(command)
+                    if command.startswith("LI"):
+                        _LOGGER.info("Sent login")
+                    else:
+                        self.frame_log.log("Sent", command[:2], shown)
+                    if self.capture is not None:
+                        captured.append(frame if shown == command else encode(shown))
+                data = b"".join(frames)
+                self.metrics.bytes_out += len(data)
+                if self.capture is not None:
+                    self.capture.record(OUTBOUND, b"".join(captured))
+                self.writer.write(data)  # type: ignore  # noqa: PGH003
+                await self.writer.drain()  # type: ignore  # noqa: PGH003
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            _LOGGER.exception("Failed to send message: %s", e)  # noqa: TRY401
+            # Closing the stream ends the listener, and with it the session.
+            if self.writer:
+                self.writer.close()
+
+    async def async_set_capture(
+        self,
+        path: str | None,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        backup_count: int = DEFAULT_BACKUP_COUNT,
+    ) -> None:
+        """Start capturing raw traffic to ``path``, or stop if it is None."""
+        capture, self.capture = self.capture, None
+        if capture is not None:
+            await self.hass.async_add_executor_job(capture.close)
+        if path is not None:
+            self.capture = FrameCapture(path, max_bytes, backup_count)
+            _LOGGER.info("Capturing traffic to %s", path)
+
+    async def stop(self):  # noqa: ANN201
+        """Stop the supervisor and close the connection."""
+        self._stopping = True
+        if self._supervisor:
+            self._supervisor.cancel()
+            try:  # noqa: SIM105
+                await self._supervisor
+            except asyncio.CancelledError:
+                pass
+            self._supervisor = None
+        await self._close()
+        if self._save_unsub is not None:
+            self._save_unsub()
+            self._save_unsub = None
+            await self._store.async_save(self._snapshot())
+        await self.async_set_capture(None)
+        if self.proxy is not None:
+            await self.proxy.stop()
+            self.proxy = None
+        _LOGGER.info("TCP client stopped")
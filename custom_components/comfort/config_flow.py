@@ -1,17 +1,30 @@
 import voluptuous as vol  # noqa: D100
 from homeassistant import config_entries
+from homeassistant.core import callback
 from homeassistant.helpers import selector
 
 from .const import (
     CONF_BUFFER_SIZE,
+    CONF_CODELESS_DISARM,
+    CONF_COUNTERS,
+    CONF_EVENT_CODES,
     CONF_HOST,
+    CONF_KEEPALIVE,
+    CONF_MESSAGE_INTERVAL,
     CONF_PIN,
     CONF_PORT,
+    CONF_PROXY_HOST,
+    CONF_PROXY_PORT,
     CONF_RETRY_INTERVAL,
+    CONF_SENSORS,
     CONF_SYSTEM_NAME,
     CONF_TIMEOUT,
+    DEFAULT_EVENT_CODES,
+    DEFAULT_MESSAGE_INTERVAL,
+    DEFAULT_PROXY_HOST,
     DOMAIN,
 )
+from .protocol import ERROR_CODE, PARSERS
 
 jonschema = vol.Schema(
     {
@@ -64,6 +77,17 @@ jonschema = vol.Schema(
                 mode=selector.NumberSelectorMode.BOX,
             ),
         ),
+        vol.Required(
+            CONF_KEEPALIVE,
+            default=(10),
+        ): selector.NumberSelector(
+            selector.NumberSelectorConfig(
+                step=1,
+                min=0,
+                max=120,
+                mode=selector.NumberSelectorMode.BOX,
+            ),
+        ),
         vol.Required(
             CONF_BUFFER_SIZE,
             default=(4096),
@@ -87,11 +111,41 @@ jonschema = vol.Schema(
 )
 
 
+def parse_deadbands(text: str) -> dict[int, float]:
+    """
+    Parse a list like ``1, 4:2.5`` into {item: deadband}.
+
+    Items are panel counter or sensor numbers; the deadband after a colon is
+    the smallest change that updates the entity, 0 if not given.
+    """
+    items: dict[int, float] = {}
+    for part in filter(None, (part.strip() for part in text.split(","))):
+        item, _, deadband = part.partition(":")
+        try:
+            number, band = int(item), float(deadband or 0)
+        except ValueError as err:
+            msg = f"Invalid item {part!r}"
+            raise vol.Invalid(msg) from err
+        if not 0 <= number <= 0xFF or band < 0:  # noqa: PLR2004
+            msg = f"Invalid item {part!r}"
+            raise vol.Invalid(msg)
+        items[number] = band
+    return items
+
+
 class ComfortConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
     """Handle a config flow for Comfort Integration."""
 
     VERSION = 1
 
+    @staticmethod
+    @callback
+    def async_get_options_flow(
+        config_entry: config_entries.ConfigEntry,  # noqa: ARG004
+    ) -> config_entries.OptionsFlow:
+        """Return the options flow."""
+        return ComfortOptionsFlow()
+
     async def async_step_user(self, user_input=None):  # noqa: ANN001, ANN201, D102
         errors = {}
 
@@ -114,3 +168,70 @@ class ComfortConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                 data_updates=user_input,
             )
         return self.async_show_form(step_id="reconfigure", data_schema=jonschema)
+
+
+class ComfortOptionsFlow(config_entries.OptionsFlow):
+    """Handle runtime options that don't change the connection."""
+
+    async def async_step_init(self, user_input=None):  # noqa: ANN001, ANN201, D102
+        errors = {}
+        if user_input is not None:
+            for key in (CONF_COUNTERS, CONF_SENSORS):
+                try:
+                    parse_deadbands(user_input.get(key, ""))
+                except vol.Invalid:
+                    errors[key] = "invalid_items"
+            if not errors:
+                return self.async_create_entry(data=user_input)
+
+        options = self.config_entry.options
+        schema = vol.Schema(
+            {
+                vol.Required(
+                    CONF_MESSAGE_INTERVAL,
+                    default=options.get(
+                        CONF_MESSAGE_INTERVAL, DEFAULT_MESSAGE_INTERVAL
+                    ),
+                ): selector.NumberSelector(
+                    selector.NumberSelectorConfig(
+                        step=0.1,
+                        min=0,
+                        max=60,
+                        mode=selector.NumberSelectorMode.BOX,
+                    ),
+                ),
+                vol.Required(
+                    CONF_EVENT_CODES,
+                    default=options.get(CONF_EVENT_CODES, DEFAULT_EVENT_CODES),
+                ): selector.SelectSelector(
+                    selector.SelectSelectorConfig(
+                        options=sorted({*PARSERS, ERROR_CODE, "OK", "cc"}),
+                        multiple=True,
+                        custom_value=True,
+                        mode=selector.SelectSelectorMode.DROPDOWN,
+                    ),
+                ),
+                vol.Optional(
+                    CONF_COUNTERS, default=options.get(CONF_COUNTERS, "")
+                ): selector.TextSelector(),
+                vol.Optional(
+                    CONF_SENSORS, default=options.get(CONF_SENSORS, "")
+                ): selector.TextSelector(),
+                vol.Optional(
+                    CONF_CODELESS_DISARM,
+                    default=options.get(CONF_CODELESS_DISARM, False),
+                ): selector.BooleanSelector(),
+                vol.Optional(
+                    CONF_PROXY_PORT, default=options.get(CONF_PROXY_PORT, 0)
+                ): selector.NumberSelector(
+                    selector.NumberSelectorConfig(
+                        min=0, max=65535, mode=selector.NumberSelectorMode.BOX
+                    ),
+                ),
+                vol.Optional(
+                    CONF_PROXY_HOST,
+                    default=options.get(CONF_PROXY_HOST, DEFAULT_PROXY_HOST),
+                ): selector.TextSelector(),
+            }
+        )
+        return self.async_show_form(step_id="init", data_schema=schema, errors=errors)
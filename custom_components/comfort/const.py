@@ -6,5 +6,41 @@ CONF_TIMEOUT = "timeout"
 CONF_RETRY_INTERVAL = "retry_interval"
 CONF_BUFFER_SIZE = "buffer_size"
 CONF_SYSTEM_NAME = "system_name"
+CONF_KEEPALIVE = "keepalive"
+CONF_MESSAGE_INTERVAL = "message_interval"
+CONF_EVENT_CODES = "event_codes"
+CONF_COUNTERS = "counters"
+CONF_SENSORS = "sensors"
+CONF_PROXY_PORT = "proxy_port"
+CONF_PROXY_HOST = "proxy_host"
+CONF_CODELESS_DISARM = "codeless_disarm"
 DEFAULT_PORT = 1001
+DEFAULT_BUFFER_SIZE = 4096
+DEFAULT_TIMEOUT = 30
+DEFAULT_RETRY_INTERVAL = 5
+MAX_RETRY_INTERVAL = 300
+DEFAULT_KEEPALIVE = 10
+# Minimum seconds between Last Message state writes (0 writes every frame).
+DEFAULT_MESSAGE_INTERVAL = 1
+DEFAULT_PROXY_HOST = "127.0.0.1"
+STORAGE_KEY = f"{DOMAIN}.{{}}"
+STORAGE_VERSION = 1
+# Seconds to wait after a state change before saving the state cache.
+STATE_SAVE_DELAY = 10
+# Outbound frames that may wait for the writer before senders are held back.
+MAX_QUEUED_FRAMES = 128
 EVENT_MESSAGE = f"{DOMAIN}_message"
+# Message codes fired as EVENT_MESSAGE by default: the ones reporting a change
+# on the panel, not acknowledgements, echoes or replies to our own queries.
+DEFAULT_EVENT_CODES = ["AL", "AM", "CT", "ER", "EX", "FL", "IP", "LU", "MD", "OP", "sr"]
+
+# Dispatcher signals, formatted with the config entry id (and item number).
+SIGNAL_AVAILABLE = f"{DOMAIN}_available_{{}}"
+SIGNAL_FRAME = f"{DOMAIN}_frame_{{}}"
+SIGNAL_ZONE = f"{DOMAIN}_zone_{{}}_{{}}"
+SIGNAL_ZONE_COUNT = f"{DOMAIN}_zone_count_{{}}"
+SIGNAL_OUTPUT = f"{DOMAIN}_output_{{}}_{{}}"
+SIGNAL_OUTPUT_COUNT = f"{DOMAIN}_output_count_{{}}"
+SIGNAL_SECURITY = f"{DOMAIN}_security_{{}}"
+SIGNAL_COUNTER = f"{DOMAIN}_counter_{{}}_{{}}"
+SIGNAL_SENSOR = f"{DOMAIN}_sensor_{{}}_{{}}"
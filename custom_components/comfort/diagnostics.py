@@ -0,0 +1,40 @@
+"""Diagnostics support for the Comfort integration."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.components.diagnostics import async_redact_data
+
+from .const import CONF_PIN, DOMAIN
+
+if TYPE_CHECKING:
+    from homeassistant.config_entries import ConfigEntry
+    from homeassistant.core import HomeAssistant
+
+    from .client import TCPClient
+
+TO_REDACT = {CONF_PIN}
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    """Return the connection state and runtime metrics of a config entry."""
+    client: TCPClient = hass.data[DOMAIN][entry.entry_id]
+    return {
+        "entry": async_redact_data(entry.as_dict(), TO_REDACT),
+        "connection": {
+            "state": client.state,
+            "heartbeat_rtt": client.heartbeat_rtt,
+            "proxy_clients": len(client.proxy.sessions) if client.proxy else None,
+        },
+        "panel": {
+            "zone_count": client.zone_count,
+            "output_count": client.output_count,
+            "mode": client.mode,
+            "counters": client.counter_values,
+            "sensors": client.sensor_values,
+        },
+        "metrics": client.metrics.as_dict(),
+    }
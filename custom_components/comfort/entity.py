@@ -0,0 +1,40 @@
+"""Base entity for the Comfort integration."""
+
+from homeassistant.core import callback
+from homeassistant.helpers.device_registry import DeviceInfo
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
+from homeassistant.helpers.entity import Entity
+
+from .client import TCPClient
+from .const import DOMAIN, SIGNAL_AVAILABLE
+
+
+class ComfortEntity(Entity):
+    """Entity fed by dispatcher signals from a TCPClient."""
+
+    _attr_should_poll = False
+    _attr_has_entity_name = True
+
+    def __init__(self, client: TCPClient) -> None:
+        """Attach the entity to the client of its config entry."""
+        self._client = client
+        self._attr_device_info = DeviceInfo(identifiers={(DOMAIN, client.entry_id)})
+
+    @property
+    def available(self) -> bool:
+        """Return whether the panel session is up."""
+        return self._client.available
+
+    async def async_added_to_hass(self) -> None:
+        """Follow the connection state."""
+        self.async_on_remove(
+            async_dispatcher_connect(
+                self.hass,
+                SIGNAL_AVAILABLE.format(self._client.entry_id),
+                self._handle_available,
+            )
+        )
+
+    @callback
+    def _handle_available(self, _available: bool) -> None:  # noqa: FBT001
+        self.async_write_ha_state()
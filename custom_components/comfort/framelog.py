@@ -0,0 +1,62 @@
+"""Rate-limited per-frame debug logging for the TCP client."""
+
+from __future__ import annotations
+
+import logging
+import time
+
+# Frames are logged as received; repr() keeps the \x03 start byte readable.
+_FORMAT = "%s %r"
+_FORMAT_SUPPRESSED = "%s %r (%d more %s frames not logged)"
+
+
+class FrameLogger:
+    """
+    Log frames at DEBUG, at most once per interval for each message code.
+
+    Nothing is formatted unless DEBUG is enabled for the logger and the code
+    is due, so a busy panel costs one level check per frame.
+    """
+
+    __slots__ = ("_due", "_logger", "_suppressed", "default_interval", "intervals")
+
+    def __init__(self, logger: logging.Logger, default_interval: float = 0) -> None:
+        """Log every frame by default; see set_interval to throttle codes."""
+        self._logger = logger
+        self._due: dict[str, float] = {}
+        self._suppressed: dict[str, int] = {}
+        # Seconds between logged frames of a code; None turns the code off.
+        self.default_interval: float | None = default_interval
+        self.intervals: dict[str, float | None] = {}
+
+    def set_interval(self, interval: float | None, codes: list[str] | None) -> None:
+        """Change the interval for the given codes, or for all codes if None."""
+        if codes is None:
+            self.default_interval = interval
+            self.intervals.clear()
+        else:
+            for code in codes:
+                self.intervals[code] = interval
+        self._due.clear()
+        self._suppressed.clear()
+
+    def log(self, direction: str, code: str, frame: str) -> None:
+        """Log one frame if DEBUG is enabled and the code is due."""
+        if not self._logger.isEnabledFor(logging.DEBUG):
+            return
+        interval = self.intervals.get(code, self.default_interval)
+        if interval is None:
+            return
+        if interval:
+            now = time.monotonic()
+            if now < self._due.get(code, 0):
+                self._suppressed[code] = self._suppressed.get(code, 0) + 1
+                return
+            self._due[code] = now + interval
+            suppressed = self._suppressed.pop(code, 0)
+            if suppressed:
+                self._logger.debug(
+                    _FORMAT_SUPPRESSED, direction, frame, suppressed, code
+                )
+                return
+        self._logger.debug(_FORMAT, direction, frame)
@@ -0,0 +1,158 @@
+"""Cheap runtime counters and histograms for the TCP client."""
+
+from __future__ import annotations
+
+import time
+from bisect import bisect_left
+from collections import Counter
+
+# Upper bounds in seconds; the last bucket catches everything slower.
+LATENCY_BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+DECODE_BUCKETS = (0.000005, 0.00001, 0.000025, 0.00005, 0.0001, 0.00025, 0.001)
+# Frame rates are measured over windows of at least this many seconds.
+RATE_WINDOW = 60
+
+
+class Histogram:
+    """Fixed-bucket histogram that also keeps count, sum and maximum."""
+
+    __slots__ = ("bounds", "buckets", "count", "maximum", "total")
+
+    def __init__(self, bounds: tuple[float, ...]) -> None:
+        """Create an empty histogram with the given bucket upper bounds."""
+        self.bounds = bounds
+        self.buckets = [0] * (len(bounds) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.maximum = 0.0
+
+    def add(self, value: float) -> None:
+        """Record one value."""
+        self.buckets[bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.total += value
+        self.maximum = max(self.maximum, value)
+
+    @property
+    def mean(self) -> float | None:
+        """Return the mean of the recorded values."""
+        return self.total / self.count if self.count else None
+
+    def as_dict(self) -> dict:
+        """Return the histogram for diagnostics."""
+        labels = [f"<={bound}" for bound in self.bounds] + [f">{self.bounds[-1]}"]
+        return {
+            "count": self.count,
+            "mean": self.mean,
+            "max": self.maximum,
+            "buckets": dict(zip(labels, self.buckets, strict=True)),
+        }
+
+
+class ClientMetrics:
+    """Traffic, latency and connection counters kept by a TCPClient."""
+
+    __slots__ = (
+        "_down_since",
+        "_window_counts",
+        "_window_rates",
+        "_window_start",
+        "bytes_in",
+        "bytes_out",
+        "command_latency",
+        "decode_time",
+        "downtime",
+        "frames",
+        "malformed",
+        "max_queue_depth",
+        "mode_latencies",
+        "queue_depth",
+        "reconnects",
+        "resyncs",
+    )
+
+    def __init__(self) -> None:
+        """Start with everything at zero."""
+        self.frames: Counter[str] = Counter()
+        self.bytes_in = 0
+        self.bytes_out = 0
+        # Framing resyncs after line noise, and frames whose fields didn't parse.
+        self.resyncs = 0
+        self.malformed = 0
+        self.decode_time = Histogram(DECODE_BUCKETS)
+        self.command_latency = Histogram(LATENCY_BUCKETS)
+        # Arm/disarm request to confirmed mode change, by target mode.
+        self.mode_latencies: dict[str, Histogram] = {}
+        self.queue_depth = 0
+        self.max_queue_depth = 0
+        self.reconnects = 0
+        self.downtime = 0.0
+        self._down_since: float | None = None
+        self._window_start = time.monotonic()
+        self._window_counts: Counter[str] = Counter()
+        self._window_rates: dict[str, float] = {}
+
+    def mode_latency(self, mode: str) -> Histogram:
+        """Return the arm/disarm latency histogram for a target mode."""
+        if mode not in self.mode_latencies:
+            self.mode_latencies[mode] = Histogram(LATENCY_BUCKETS)
+        return self.mode_latencies[mode]
+
+    def record_queue_depth(self, depth: int) -> None:
+        """Record the outbound queue depth seen by the writer."""
+        self.queue_depth = depth
+        self.max_queue_depth = max(self.max_queue_depth, depth)
+
+    def connection_lost(self) -> None:
+        """Start counting downtime after a live session ended."""
+        if self._down_since is None:
+            self._down_since = time.monotonic()
+
+    def connection_ready(self) -> None:
+        """Stop counting downtime; a session is live again."""
+        if self._down_since is not None:
+            self.downtime += time.monotonic() - self._down_since
+            self._down_since = None
+            self.reconnects += 1
+
+    @property
+    def current_downtime(self) -> float:
+        """Return total downtime in seconds, including an ongoing outage."""
+        if self._down_since is None:
+            return self.downtime
+        return self.downtime + time.monotonic() - self._down_since
+
+    def frame_rates(self) -> dict[str, float]:
+        """Return frames per second by message code over the last full window."""
+        now = time.monotonic()
+        elapsed = now - self._window_start
+        if elapsed >= RATE_WINDOW:
+            self._window_rates = {
+                code: (count - self._window_counts[code]) / elapsed
+                for code, count in self.frames.items()
+                if count != self._window_counts[code]
+            }
+            self._window_counts = self.frames.copy()
+            self._window_start = now
+        return self._window_rates
+
+    def as_dict(self) -> dict:
+        """Return all metrics for diagnostics."""
+        return {
+            "frames": dict(self.frames),
+            "frames_per_second": self.frame_rates(),
+            "bytes_in": self.bytes_in,
+            "bytes_out": self.bytes_out,
+            "resyncs": self.resyncs,
+            "malformed": self.malformed,
+            "decode_time": self.decode_time.as_dict(),
+            "command_latency": self.command_latency.as_dict(),
+            "mode_latency": {
+                mode: histogram.as_dict()
+                for mode, histogram in self.mode_latencies.items()
+            },
+            "queue_depth": self.queue_depth,
+            "max_queue_depth": self.max_queue_depth,
+            "reconnects": self.reconnects,
+            "downtime": self.current_downtime,
+        }
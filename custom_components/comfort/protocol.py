@@ -0,0 +1,410 @@
+"""Decoder for the Comfort ASCII protocol."""
+
+from __future__ import annotations
+
+import re
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+FRAME_START = "\x03"
+FRAME_END = "\r"
+# A frame is the start byte, a code such as IP, Z? or M!, and printable data.
+_FRAME = re.compile(rb"\x03[A-Za-z][A-Za-z?!][\x20-\x7e]*")
+# An outbound command has the same shape, with only hex data after its code.
+_COMMAND = re.compile(r"\x03[A-Za-z][A-Za-z?!][0-9A-Fa-f]*\r\n?")
+
+# Reply codes for commands that are not answered by the rule in reply_codes().
+REPLY_CODES = {
+    "LI": ("LU",),
+    "cc": ("cc",),
+    "m!": ("MD", "ER"),
+    "M!": ("MD", "ER"),
+}
+# Negative acknowledgement; it does not say which command it refers to.
+ERROR_CODE = "NA"
+
+# Outbound priorities, lowest first: security commands overtake everything,
+# control commands overtake status queries.
+PRIORITY_SECURITY = 0
+PRIORITY_CONTROL = 1
+PRIORITY_POLL = 2
+SECURITY_COMMANDS = frozenset({"LI", "m!", "M!", "KD"})
+# Commands carrying a user code, with the length of the prefix safe to log.
+CODE_COMMANDS = {"LI": 2, "m!": 4, "M!": 4}
+
+SECURITY_MODES = {
+    0: "off",
+    1: "away",
+    2: "night",
+    3: "day",
+    4: "vacation",
+}
+
+# AM system alarm types; the bool says whether the alarm counts as triggered.
+SYSTEM_ALARMS = {
+    0: ("Intruder", True),
+    1: ("Zone Trouble", True),
+    2: ("Low Battery", True),
+    3: ("Power Failure", True),
+    4: ("Phone Trouble", True),
+    5: ("Duress", True),
+    6: ("Arm Failure", True),
+    8: ("Disarm", False),
+    9: ("Arm", False),
+    10: ("Tamper", True),
+    12: ("Entry Warning", False),
+    13: ("Alarm Abort", False),
+    14: ("Siren Tamper", True),
+    15: ("Bypass", False),
+    17: ("Dial Test", False),
+    19: ("Entry Alert", False),
+    20: ("Fire", True),
+    21: ("Panic", True),
+    22: ("GSM Trouble", True),
+    23: ("New Message", False),
+    24: ("Doorbell", False),
+    25: ("Comms Failure RS485", True),
+    26: ("Signin Tamper", True),
+}
+
+
+def _byte(data: str, index: int) -> int:
+    """Return the hex byte at position ``index`` of ``data``."""
+    return int(data[index * 2 : index * 2 + 2], 16)
+
+
+def _word(data: str, index: int) -> int:
+    """Return the little-endian 16 bit value starting at byte ``index``."""
+    return _byte(data, index) | _byte(data, index + 1) << 8
+
+
+def _bits(data: str) -> int:
+    """Return hex bytes as a bitmask; bit 0 of the first byte is item 1."""
+    return int.from_bytes(bytes.fromhex(data), "little")
+
+
+def iter_bits(mask: int) -> Iterator[int]:
+    """Yield the 1-based item number of every set bit in ``mask``."""
+    while mask:
+        low = mask & -mask
+        yield low.bit_length()
+        mask ^= low
+
+
+def changed_bits(old: int, old_count: int, new: int, new_count: int) -> int:
+    """Return the mask of items that differ, counting newly reported items."""
+    return (old ^ new) | (
+        (1 << new_count) - (1 << old_count) if new_count > old_count else 0
+    )
+
+
+class ComfortMessage:
+    """A decoded Comfort frame; also used as-is for codes without fields."""
+
+    __slots__ = ("code", "raw")
+
+    def __init__(self, code: str, raw: str) -> None:
+        """Decode ``raw``, a frame including its start byte and reply code."""
+        self.code = code
+        self.raw = raw
+        self._parse(raw[3:])
+
+    def _parse(self, data: str) -> None:
+        pass
+
+    def __repr__(self) -> str:
+        """Return the frame as it was received, for logging."""
+        return f"<{type(self).__name__} {self.raw[1:]}>"
+
+
+class LoginReport(ComfortMessage):
+    """LU - user logged in (user 0 means logged out or bad PIN)."""
+
+    __slots__ = ("user",)
+
+    def _parse(self, data: str) -> None:
+        self.user = _byte(data, 0)
+
+
+class InputReport(ComfortMessage):
+    """IP - a single zone input changed state."""
+
+    __slots__ = ("state", "zone")
+
+    def _parse(self, data: str) -> None:
+        self.zone = _byte(data, 0)
+        self.state = _byte(data, 1)
+
+
+class ZoneStatesReport(ComfortMessage):
+    """Z? - state of every zone input."""
+
+    __slots__ = ("bits", "count")
+
+    def _parse(self, data: str) -> None:
+        self.bits = _bits(data)
+        self.count = len(data) // 2 * 8
+
+
+class OutputReport(ComfortMessage):
+    """OP - a single output changed state."""
+
+    __slots__ = ("output", "state")
+
+    def _parse(self, data: str) -> None:
+        self.output = _byte(data, 0)
+        self.state = _byte(data, 1)
+
+
+class OutputStatesReport(ComfortMessage):
+    """Y? - state of every output."""
+
+    __slots__ = ("bits", "count")
+
+    def _parse(self, data: str) -> None:
+        self.bits = _bits(data)
+        self.count = len(data) // 2 * 8
+
+
+class FlagReport(ComfortMessage):
+    """FL - a single flag changed state."""
+
+    __slots__ = ("flag", "state")
+
+    def _parse(self, data: str) -> None:
+        self.flag = _byte(data, 0)
+        self.state = _byte(data, 1)
+
+
+class FlagStatesReport(ComfortMessage):
+    """f? - state of every flag; the first byte echoes the request."""
+
+    __slots__ = ("bits", "count")
+
+    def _parse(self, data: str) -> None:
+        self.bits = _bits(data[2:])
+        self.count = len(data[2:]) // 2 * 8
+
+
+class SecurityModeReport(ComfortMessage):
+    """M? reply or MD change report carrying the security mode."""
+
+    __slots__ = ("mode", "user")
+
+    def _parse(self, data: str) -> None:
+        self.mode = _byte(data, 0)
+        self.user = _byte(data, 1) if len(data) >= 4 else None  # noqa: PLR2004
+
+    @property
+    def mode_name(self) -> str | None:
+        """Return the name of the security mode."""
+        return SECURITY_MODES.get(self.mode)
+
+
+class CounterReport(ComfortMessage):
+    """C? reply or CT change report carrying a counter value."""
+
+    __slots__ = ("counter", "value")
+
+    def _parse(self, data: str) -> None:
+        self.counter = _byte(data, 0)
+        # Counters are 16 bit, low byte first, though some firmware sends one byte.
+        self.value = _word(data, 1) if len(data) >= 6 else _byte(data, 1)  # noqa: PLR2004
+
+
+class SensorReport(ComfortMessage):
+    """s? reply or sr change report carrying a signed sensor value."""
+
+    __slots__ = ("sensor", "value")
+
+    def _parse(self, data: str) -> None:
+        self.sensor = _byte(data, 0)
+        value = _word(data, 1)
+        self.value = value - 0x10000 if value & 0x8000 else value
+
+
+class AlarmTypeReport(ComfortMessage):
+    """AL - current alarm type (0 means no alarm)."""
+
+    __slots__ = ("alarm",)
+
+    def _parse(self, data: str) -> None:
+        self.alarm = _byte(data, 0)
+
+
+class SystemAlarmReport(ComfortMessage):
+    """AM - system alarm with its parameter (usually a zone)."""
+
+    __slots__ = ("alarm", "parameter")
+
+    def _parse(self, data: str) -> None:
+        self.alarm = _byte(data, 0)
+        self.parameter = _byte(data, 1)
+
+    @property
+    def name(self) -> str:
+        """Return a readable description of the alarm."""
+        return SYSTEM_ALARMS.get(self.alarm, (f"Alarm {self.alarm}", True))[0]
+
+    @property
+    def triggered(self) -> bool:
+        """Return whether this alarm means the system is triggered."""
+        return SYSTEM_ALARMS.get(self.alarm, ("", True))[1]
+
+
+class ArmReadyReport(ComfortMessage):
+    """ER - arm ready (zone 0) or the first zone stopping arming."""
+
+    __slots__ = ("zone",)
+
+    def _parse(self, data: str) -> None:
+        self.zone = _byte(data, 0)
+
+
+ENTRY_DELAY = 1
+EXIT_DELAY = 2
+
+
+class EntryExitReport(ComfortMessage):
+    """EX - entry (type 1) or exit (type 2) delay started, in seconds."""
+
+    __slots__ = ("delay", "type")
+
+    def _parse(self, data: str) -> None:
+        self.type = _byte(data, 0)
+        self.delay = _byte(data, 1)
+
+
+PARSERS: dict[str, type[ComfortMessage]] = {
+    "LU": LoginReport,
+    "IP": InputReport,
+    "Z?": ZoneStatesReport,
+    "OP": OutputReport,
+    "Y?": OutputStatesReport,
+    "FL": FlagReport,
+    "f?": FlagStatesReport,
+    "M?": SecurityModeReport,
+    "MD": SecurityModeReport,
+    "CT": CounterReport,
+    "C?": CounterReport,
+    "s?": SensorReport,
+    "sr": SensorReport,
+    "AL": AlarmTypeReport,
+    "AM": SystemAlarmReport,
+    "ER": ArmReadyReport,
+    "EX": EntryExitReport,
+}
+
+
+def encode(command: str) -> bytes:
+    """Frame a command such as ``Z?`` or ``O!0101`` for sending."""
+    return f"{FRAME_START}{command}{FRAME_END}".encode("ascii")
+
+
+def reply_codes(command: str) -> tuple[str, ...]:
+    """
+    Return the reply codes that answer ``command``.
+
+    Queries are answered with their own code and everything else with OK,
+    apart from the exceptions in REPLY_CODES.
+    """
+    code = command[:2]
+    if code in REPLY_CODES:
+        return REPLY_CODES[code]
+    return (code,) if code.endswith("?") else ("OK",)
+
+
+def is_command(message: str) -> bool:
+    """Return whether ``message`` is one complete command that the panel answers."""
+    return _COMMAND.fullmatch(message) is not None
+
+
+def redact(command: str) -> str:
+    """Return ``command`` with any user code in it masked, for logs and captures."""
+    keep = CODE_COMMANDS.get(command[:2])
+    if keep is None:
+        return command
+    return command[:keep] + "*" * (len(command) - keep)
+
+
+def priority(command: str) -> int:
+    """Return the outbound queue priority for ``command``."""
+    code = command[:2]
+    if code in SECURITY_COMMANDS:
+        return PRIORITY_SECURITY
+    return PRIORITY_POLL if code.endswith("?") else PRIORITY_CONTROL
+
+
+class FrameBuffer:
+    """
+    Collect received bytes and split out every complete, well-formed frame.
+
+    Line noise costs only the frames it touches: bytes before a start byte,
+    frames that run into the next one, malformed frames and anything longer
+    than ``max_frame`` are dropped, and framing picks up again at the next
+    start byte. Each such drop counts as one resync.
+    """
+
+    __slots__ = ("_buffer", "max_frame", "resyncs")
+
+    def __init__(self, max_frame: int = 512) -> None:
+        """Start with an empty buffer."""
+        self._buffer = bytearray()
+        self.max_frame = max_frame
+        self.resyncs = 0
+
+    def feed(self, data: bytes) -> list[str]:
+        """Add a chunk of received bytes and return the complete frames in it."""
+        buffer = self._buffer
+        buffer += data
+        frames = []
+        end = buffer.rfind(b"\r")
+        if end >= 0:
+            # Copy everything up to the last terminator out once, through a
+            # view so the slice isn't copied first, and keep the partial frame.
+            with memoryview(buffer) as view:
+                chunk = bytes(view[:end])
+            del buffer[: end + 1]
+            for piece in chunk.split(b"\r"):
+                frame = self._check(piece)
+                if frame is not None:
+                    frames.append(frame)
+        while len(buffer) > self.max_frame:
+            # No terminator in sight: skip to the next start byte, if any.
+            start = buffer.find(b"\x03", 1)
+            del buffer[: start if start > 0 else len(buffer)]
+            self.resyncs += 1
+        return frames
+
+    def _check(self, piece: bytes) -> str | None:
+        """Return the frame in one terminated piece, or None to drop it."""
+        start = piece.rfind(b"\x03")
+        if start < 0:
+            if piece.strip():
+                self.resyncs += 1
+            return None
+        if start and piece[:start].strip():
+            # Noise, or a frame that lost its terminator, before this one.
+            self.resyncs += 1
+        frame = piece[start:].rstrip()
+        if len(frame) > self.max_frame or not _FRAME.fullmatch(frame):
+            self.resyncs += 1
+            return None
+        return frame.decode("ascii")
+
+
+def decode(frame: str) -> ComfortMessage | None:
+    """
+    Decode one frame, without its terminator, into a message object.
+
+    Returns None when the frame is not a Comfort reply or its fields are malformed.
+    """
+    if len(frame) < 3 or frame[0] != FRAME_START:  # noqa: PLR2004
+        return None
+    code = frame[1:3]
+    try:
+        return PARSERS.get(code, ComfortMessage)(code, frame)
+    except ValueError:
+        return None
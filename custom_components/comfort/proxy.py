@@ -0,0 +1,228 @@
+"""
+Local listener that shares the client's panel session with other tools.
+
+The Ethernet module takes a single TCP session, which the TCPClient holds.
+Tools such as Comfigurator connect here instead: unsolicited frames from the
+panel go to every logged-in tool, each tool's commands are sent with
+TCPClient.request() so the reply comes back only to that tool, and logins
+are checked locally so a tool never logs the shared session in or out.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hmac
+import logging
+import re
+from typing import TYPE_CHECKING
+
+from .client import ComfortCommandError, ComfortError
+from .const import DEFAULT_PROXY_HOST
+from .protocol import FRAME_END, FRAME_START
+
+if TYPE_CHECKING:
+    from .client import TCPClient
+
+_LOGGER = logging.getLogger(__name__)
+
+# Tools that stop reading are dropped once this much output is waiting.
+MAX_WRITE_BUFFER = 256 * 1024
+# A partial command longer than this is dropped, as FrameBuffer drops frames.
+MAX_COMMAND = 512
+# Wrong PINs allowed from one address before it is locked out. The lockout
+# doubles with each further wrong PIN, and an address's count is forgotten
+# after MAX_LOCKOUT seconds without failures.
+MAX_LOGIN_FAILURES = 3
+LOCKOUT = 30.0
+MAX_LOCKOUT = 3600.0
+# Commands from one tool awaiting their turn to reply; reading pauses beyond.
+MAX_IN_FLIGHT = 64
+_SEPARATOR = re.compile(rb"[\r\n]+")
+
+
+class _Session:
+    """One connected tool and its own login state."""
+
+    __slots__ = ("closing", "logged_in", "peer", "writer")
+
+    def __init__(self, writer: asyncio.StreamWriter) -> None:
+        self.writer = writer
+        self.peer = writer.get_extra_info("peername")
+        self.logged_in = False
+        # Set to close the connection once the replies queued so far are sent.
+        self.closing = False
+
+    def send(self, data: bytes) -> None:
+        """Write without waiting, dropping the tool if it has stopped reading."""
+        if self.writer.is_closing():
+            return
+        if self.writer.transport.get_write_buffer_size() > MAX_WRITE_BUFFER:
+            _LOGGER.warning("Dropping proxy client %s: not reading", self.peer)
+            self.writer.close()
+            return
+        self.writer.write(data)
+
+
+class ComfortProxy:
+    """Multiplex local tool connections over one TCPClient session."""
+
+    def __init__(
+        self, client: TCPClient, port: int, host: str = DEFAULT_PROXY_HOST
+    ) -> None:
+        """Serve ``client`` on ``host``:``port`` once started."""
+        self.client = client
+        self.host = host
+        self.port = int(port)
+        self.sessions: set[_Session] = set()
+        self._server: asyncio.Server | None = None
+        self._tasks: set[asyncio.Task] = set()
+        # Failed logins by peer address: count, time of the last, locked until.
+        self._failures: dict[str, tuple[int, float, float]] = {}
+
+    async def start(self) -> None:
+        """Start listening; raises OSError if the port is taken."""
+        self._server = await asyncio.start_server(self._handle, self.host, self.port)
+        _LOGGER.info("Sharing the panel session on port %s", self.port)
+
+    async def stop(self) -> None:
+        """Stop listening and disconnect every tool."""
+        server, self._server = self._server, None
+        if server is not None:
+            server.close()
+        for task in self._tasks:
+            task.cancel()
+        for session in self.sessions:
+            session.writer.close()
+        self.sessions.clear()
+        if server is not None:
+            await server.wait_closed()
+
+    def broadcast(self, frame: str) -> None:
+        """Send an unsolicited panel frame to every logged-in tool."""
+        data = (frame + FRAME_END).encode()
+        for session in self.sessions:
+            if session.logged_in:
+                session.send(data)
+
+    async def _handle(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        """Read frames from one tool until it disconnects."""
+        session = _Session(writer)
+        self.sessions.add(session)
+        _LOGGER.info("Proxy client %s connected", session.peer)
+        # Replies in the order the tool sent its commands, as the panel does.
+        replies: asyncio.Queue[asyncio.Future[bytes | None]] = asyncio.Queue(
+            MAX_IN_FLIGHT
+        )
+        sender = asyncio.create_task(self._send_replies(session, replies))
+        buffer = b""
+        try:
+            while data := await reader.read(4096):
+                *frames, buffer = _SEPARATOR.split(buffer + data)
+                if len(buffer) > MAX_COMMAND:
+                    _LOGGER.debug("Dropping overlong command from %s", session.peer)
+                    buffer = b""
+                for frame in frames:
+                    command = frame.decode(errors="replace").strip(FRAME_START + " ")
+                    if command:
+                        await self._handle_command(session, replies, command)
+        except ConnectionError:
+            pass
+        finally:
+            sender.cancel()
+            self.sessions.discard(session)
+            writer.close()
+            _LOGGER.info("Proxy client %s disconnected", session.peer)
+
+    async def _handle_command(
+        self,
+        session: _Session,
+        replies: asyncio.Queue[asyncio.Future[bytes | None]],
+        command: str,
+    ) -> None:
+        """Answer logins and heartbeats locally and forward the rest."""
+        code = command[:2]
+        if session.closing:
+            return
+        if code == "LI":
+            reply = self._login(session, command[2:])
+        elif not session.logged_in:
+            # Like the panel, ignore everything until a valid login.
+            return
+        elif code == "cc":
+            reply = f"{FRAME_START}{command}\r".encode()
+        else:
+            task = asyncio.create_task(self._forward(command))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+            await replies.put(task)
+            return
+        # Local replies still wait behind the tool's earlier commands.
+        future = asyncio.get_running_loop().create_future()
+        future.set_result(reply)
+        await replies.put(future)
+
+    async def _send_replies(
+        self,
+        session: _Session,
+        replies: asyncio.Queue[asyncio.Future[bytes | None]],
+    ) -> None:
+        """Write each reply once those to earlier commands have gone."""
+        while True:
+            if (reply := await (await replies.get())) is not None:
+                session.send(reply)
+            if session.closing and replies.empty():
+                session.writer.close()
+                return
+
+    def _login(self, session: _Session, pin: str) -> bytes:
+        """Check a PIN locally and return the LU reply; empty logs the tool out."""
+        if not pin:
+            session.logged_in = False
+            return f"{FRAME_START}LU00\r".encode()
+        address = session.peer[0] if session.peer else ""
+        now = asyncio.get_running_loop().time()
+        count, _last, locked_until = self._failures.get(address, (0, 0.0, 0.0))
+        if now < locked_until:
+            # Refuse without checking, so guesses during a lockout are useless.
+            session.logged_in = False
+            session.closing = True
+            return f"{FRAME_START}LU00\r".encode()
+        session.logged_in = hmac.compare_digest(pin.encode(), self.client.pin.encode())
+        if session.logged_in:
+            self._failures.pop(address, None)
+            return f"{FRAME_START}LU01\r".encode()
+        self._forget_failures(now)
+        count += 1
+        if count >= MAX_LOGIN_FAILURES:
+            lockout = min(LOCKOUT * 2 ** (count - MAX_LOGIN_FAILURES), MAX_LOCKOUT)
+            locked_until = now + lockout
+            session.closing = True
+            _LOGGER.warning(
+                "Locking out proxy client %s for %.0f s after %d failed logins",
+                address,
+                lockout,
+                count,
+            )
+        self._failures[address] = (count, now, locked_until)
+        return f"{FRAME_START}LU00\r".encode()
+
+    def _forget_failures(self, now: float) -> None:
+        """Drop addresses with no failed login for MAX_LOCKOUT seconds."""
+        for address, (_count, last, locked_until) in list(self._failures.items()):
+            if now - last > MAX_LOCKOUT and now >= locked_until:
+                del self._failures[address]
+
+    async def _forward(self, command: str) -> bytes | None:
+        """Send one command to the panel and return its reply, if any."""
+        try:
+            reply = await self.client.request(command)
+        except ComfortCommandError as err:
+            reply = err.reply
+        except ComfortError as err:
+            # Not connected or timed out: the tool sees no reply, as it would
+            # from the panel itself.
+            _LOGGER.debug("Proxy command %s failed: %s", command[:2], err)
+            return None
+        return None if reply is None else (reply.raw + FRAME_END).encode()
@@ -1,43 +1,306 @@
-from homeassistant.components.sensor import SensorEntity  # noqa: D100
-from homeassistant.const import CONF_HOST
+from collections.abc import Callable  # noqa: D100
+from dataclasses import dataclass
+from datetime import timedelta
+
+from homeassistant.components.sensor import (
+    SensorDeviceClass,
+    SensorEntity,
+    SensorEntityDescription,
+    SensorStateClass,
+)
+from homeassistant.const import (
+    EntityCategory,
+    UnitOfDataSize,
+    UnitOfTime,
+)
 from homeassistant.core import callback
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
+from homeassistant.helpers.event import async_call_later
+
+from .client import TCPClient
+from .config_flow import parse_deadbands
+from .const import (
+    CONF_COUNTERS,
+    CONF_MESSAGE_INTERVAL,
+    CONF_SENSORS,
+    DEFAULT_MESSAGE_INTERVAL,
+    DOMAIN,
+    SIGNAL_COUNTER,
+    SIGNAL_FRAME,
+    SIGNAL_SENSOR,
+)
+from .entity import ComfortEntity
+from .protocol import ComfortMessage
+
+# Only the diagnostic metric sensors poll; everything else is pushed.
+SCAN_INTERVAL = timedelta(seconds=60)
+
+
+@dataclass(frozen=True, kw_only=True)
+class ComfortMetricDescription(SensorEntityDescription):
+    """Describes a diagnostic sensor read from the client's metrics."""
+
+    value_fn: Callable[[TCPClient], float | None]
+
+
+def _ms(seconds: float | None) -> float | None:
+    return None if seconds is None else round(seconds * 1000, 2)
 
-from .const import EVENT_MESSAGE
+
+METRIC_SENSORS = (
+    ComfortMetricDescription(
+        key="frame_rate",
+        name="Frame rate",
+        native_unit_of_measurement="frames/s",
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision=2,
+        value_fn=lambda client: sum(client.metrics.frame_rates().values()),
+    ),
+    ComfortMetricDescription(
+        key="bytes_in",
+        name="Bytes received",
+        device_class=SensorDeviceClass.DATA_SIZE,
+        native_unit_of_measurement=UnitOfDataSize.BYTES,
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda client: client.metrics.bytes_in,
+    ),
+    ComfortMetricDescription(
+        key="bytes_out",
+        name="Bytes sent",
+        device_class=SensorDeviceClass.DATA_SIZE,
+        native_unit_of_measurement=UnitOfDataSize.BYTES,
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda client: client.metrics.bytes_out,
+    ),
+    ComfortMetricDescription(
+        key="decode_time",
+        name="Mean decode time",
+        native_unit_of_measurement=UnitOfTime.MICROSECONDS,
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision=1,
+        value_fn=lambda client: (
+            None
+            if client.metrics.decode_time.mean is None
+            else client.metrics.decode_time.mean * 1_000_000
+        ),
+    ),
+    ComfortMetricDescription(
+        key="queue_depth",
+        name="Max queue depth",
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda client: client.metrics.max_queue_depth,
+    ),
+    ComfortMetricDescription(
+        key="resyncs",
+        name="Framing resyncs",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda client: client.metrics.resyncs,
+    ),
+    ComfortMetricDescription(
+        key="reconnects",
+        name="Reconnects",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda client: client.metrics.reconnects,
+    ),
+    ComfortMetricDescription(
+        key="downtime",
+        name="Downtime",
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.SECONDS,
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        suggested_display_precision=0,
+        value_fn=lambda client: client.metrics.current_downtime,
+    ),
+    ComfortMetricDescription(
+        key="command_latency",
+        name="Mean command latency",
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda client: _ms(client.metrics.command_latency.mean),
+    ),
+    ComfortMetricDescription(
+        key="heartbeat_rtt",
+        name="Heartbeat round trip",
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda client: _ms(client.heartbeat_rtt),
+    ),
+)
 
 
 async def async_setup_entry(hass, entry, async_add_entities) -> None:  # noqa: ANN001
-    """Set up message sensor."""
-    host = entry.data[CONF_HOST]
-    sensor = ComfortMessageSensor(entry.entry_id, host)
-    async_add_entities([sensor])
+    """Set up the message, counter, panel sensor and metric sensors."""
+    client = hass.data[DOMAIN][entry.entry_id]
+    interval = entry.options.get(CONF_MESSAGE_INTERVAL, DEFAULT_MESSAGE_INTERVAL)
+    sensor = ComfortMessageSensor(client, interval)
+    async_add_entities(
+        [
+            sensor,
+            *(
+                ComfortValueSensor(client, "counter", counter, deadband)
+                for counter, deadband in parse_deadbands(
+                    entry.options.get(CONF_COUNTERS, "")
+                ).items()
+            ),
+            *(
+                ComfortValueSensor(client, "sensor", sensor, deadband)
+                for sensor, deadband in parse_deadbands(
+                    entry.options.get(CONF_SENSORS, "")
+                ).items()
+            ),
+            *(
+                ComfortMetricSensor(client, description)
+                for description in METRIC_SENSORS
+            ),
+        ]
+    )
 
-    # Listen for incoming message updates
-    @callback
-    def handle_message_event(event) -> None:  # noqa: ANN001
-        data = event.data
-        if data.get("entry_id") == entry.entry_id:
-            sensor.update_message(data.get("message"))
 
-    hass.bus.async_listen(f"{EVENT_MESSAGE}_update", handle_message_event)
+class ComfortMessageSensor(ComfortEntity, SensorEntity):
+    """
+    Sensor showing the last message received.
 
+    State writes are limited to one per interval. Frames in between only
+    replace the pending value, and a trailing write makes sure the newest
+    frame is always shown; the collapsed attribute counts the frames that
+    were never written.
 
-class ComfortMessageSensor(SensorEntity):
-    """Sensor showing the last message received."""
+    Every frame is a new state, so the sensor is disabled by default to keep
+    raw traffic out of the recorder.
+    """
 
     _attr_name = "Last Message"
     _attr_icon = "mdi:message-text-outline"
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_entity_registry_enabled_default = False
+    _unrecorded_attributes = frozenset({"collapsed"})
 
-    def __init__(self, entry_id, host):  # noqa: ANN001, ANN204, D107
-        self._attr_unique_id = f"{entry_id}_last_message"
-        self._attr_extra_state_attributes = {"host": host}
-        self._state = None
+    def __init__(self, client, interval: float = 0):  # noqa: ANN001, ANN204, D107
+        super().__init__(client)
+        self._attr_unique_id = f"{client.entry_id}_last_message"
+        self._attr_extra_state_attributes = {"collapsed": 0}
+        self._state = client.last_message
+        self._interval = interval
+        self._next_write = 0.0
+        self._collapsed = 0
+        self._flush_unsub = None
 
     @property
     def state(self):  # noqa: ANN201, D102
         return self._state
 
+    async def async_added_to_hass(self) -> None:
+        """Listen for every frame from this entry's panel."""
+        await super().async_added_to_hass()
+        self.async_on_remove(
+            async_dispatcher_connect(
+                self.hass,
+                SIGNAL_FRAME.format(self._client.entry_id),
+                self.update_message,
+            )
+        )
+
+    async def async_will_remove_from_hass(self) -> None:
+        """Drop a pending trailing write."""
+        if self._flush_unsub is not None:
+            self._flush_unsub()
+            self._flush_unsub = None
+
     @callback
-    def update_message(self, msg: str):  # noqa: ANN201
+    def update_message(self, message: ComfortMessage):  # noqa: ANN201
         """Update sensor state when new message arrives."""
-        self._state = msg
+        self._state = message.raw
+        if self._flush_unsub is not None:
+            # This frame replaces the one the trailing write was due to show.
+            self._collapsed += 1
+            return
+        now = self.hass.loop.time()
+        if now < self._next_write:
+            # The trailing write will show this frame, so it isn't collapsed.
+            self._flush_unsub = async_call_later(
+                self.hass, self._next_write - now, self._flush
+            )
+            return
+        self._write(now)
+
+    @callback
+    def _flush(self, _now: object) -> None:
+        self._flush_unsub = None
+        self._write(self.hass.loop.time())
+
+    @callback
+    def _write(self, now: float) -> None:
+        self._next_write = now + self._interval
+        self._attr_extra_state_attributes["collapsed"] = self._collapsed
+        self._collapsed = 0
         self.async_write_ha_state()
+
+
+class ComfortValueSensor(ComfortEntity, SensorEntity):
+    """
+    Numeric sensor for a panel counter or sensor value.
+
+    The state is only written when the value moves by at least the deadband
+    from the last written value, so noise doesn't reach the recorder.
+    """
+
+    _attr_state_class = SensorStateClass.MEASUREMENT
+
+    def __init__(self, client, kind: str, item: int, deadband: float):  # noqa: ANN001, ANN204, D107
+        super().__init__(client)
+        self._kind = kind
+        self._item = item
+        self._deadband = deadband
+        self._attr_name = f"{kind.capitalize()} {item}"
+        self._attr_unique_id = f"{client.entry_id}_{kind}_{item}"
+        self._attr_icon = "mdi:counter" if kind == "counter" else "mdi:gauge"
+
+    async def async_added_to_hass(self) -> None:
+        """Take the current value and follow changes to it."""
+        await super().async_added_to_hass()
+        if self._kind == "counter":
+            values, signal = self._client.counter_values, SIGNAL_COUNTER
+        else:
+            values, signal = self._client.sensor_values, SIGNAL_SENSOR
+        self._attr_native_value = values.get(self._item)
+        self.async_on_remove(
+            async_dispatcher_connect(
+                self.hass,
+                signal.format(self._client.entry_id, self._item),
+                self.update_value,
+            )
+        )
+
+    @callback
+    def update_value(self, value: int) -> None:
+        """Write the new value if it is outside the deadband."""
+        last = self._attr_native_value
+        if last is not None and abs(value - last) < self._deadband:
+            return
+        self._attr_native_value = value
+        self.async_write_ha_state()
+
+
+class ComfortMetricSensor(ComfortEntity, SensorEntity):
+    """Diagnostic sensor polling one of the client's runtime metrics."""
+
+    entity_description: ComfortMetricDescription
+    _attr_should_poll = True
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_entity_registry_enabled_default = False
+
+    def __init__(self, client, description: ComfortMetricDescription):  # noqa: ANN001, ANN204, D107
+        super().__init__(client)
+        self.entity_description = description
+        self._attr_unique_id = f"{client.entry_id}_{description.key}"
+
+    @property
+    def available(self) -> bool:
+        """Metrics stay readable while the panel is unreachable."""
+        return True
+
+    async def async_update(self) -> None:
+        """Read the current metric value."""
+        self._attr_native_value = self.entity_description.value_fn(self._client)
@@ -0,0 +1,230 @@
+"""Services for the Comfort integration, shared by all config entries."""
+
+from __future__ import annotations
+
+import asyncio
+from typing import TYPE_CHECKING
+
+import voluptuous as vol
+from homeassistant.core import SupportsResponse
+from homeassistant.exceptions import HomeAssistantError, ServiceValidationError
+from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers import device_registry as dr
+
+from .capture import DEFAULT_BACKUP_COUNT, DEFAULT_MAX_BYTES
+from .client import ComfortError
+from .const import DOMAIN
+
+if TYPE_CHECKING:
+    from homeassistant.core import HomeAssistant, ServiceCall, ServiceResponse
+
+    from .client import TCPClient
+    from .protocol import ComfortMessage
+
+ATTR_CONFIG_ENTRY_ID = "config_entry_id"
+ATTR_DEVICE_ID = "device_id"
+
+TARGET_SCHEMA = {
+    vol.Optional(ATTR_CONFIG_ENTRY_ID): vol.All(cv.ensure_list, [cv.string]),
+    vol.Optional(ATTR_DEVICE_ID): vol.All(cv.ensure_list, [cv.string]),
+}
+
+SEND_MESSAGE_SCHEMA = vol.Schema({**TARGET_SCHEMA, vol.Required("message"): cv.string})
+SEND_COMMANDS_SCHEMA = vol.Schema(
+    {
+        **TARGET_SCHEMA,
+        vol.Required("commands"): vol.All(
+            cv.ensure_list, [cv.string], vol.Length(min=1)
+        ),
+        vol.Optional("timeout"): vol.Coerce(float),
+    }
+)
+SET_OUTPUTS_SCHEMA = vol.Schema(
+    {
+        **TARGET_SCHEMA,
+        vol.Required("outputs"): vol.All(
+            {vol.All(vol.Coerce(int), vol.Range(min=1, max=0xFF)): cv.boolean},
+            vol.Length(min=1),
+        ),
+    }
+)
+SET_FRAME_LOGGING_SCHEMA = vol.Schema(
+    {
+        **TARGET_SCHEMA,
+        vol.Optional("interval", default=0): vol.Coerce(float),
+        vol.Optional("codes"): vol.All(cv.ensure_list, [cv.string]),
+        vol.Optional("enabled", default=True): cv.boolean,
+    }
+)
+SET_CAPTURE_SCHEMA = vol.Schema(
+    {
+        **TARGET_SCHEMA,
+        vol.Optional("enabled", default=True): cv.boolean,
+        vol.Optional("max_size", default=DEFAULT_MAX_BYTES / 1e6): vol.Coerce(float),
+        vol.Optional("backups", default=DEFAULT_BACKUP_COUNT): vol.Coerce(int),
+    }
+)
+
+
+def target_clients(
+    hass: HomeAssistant, call: ServiceCall, *, default_all: bool = False
+) -> dict[str, TCPClient]:
+    """
+    Return the clients a service call targets, keyed by config entry id.
+
+    Without a target the call goes to the only panel, or to every panel if
+    ``default_all`` is set; otherwise a target is required.
+    """
+    clients: dict[str, TCPClient] = hass.data.get(DOMAIN, {})
+    entry_ids = set(call.data.get(ATTR_CONFIG_ENTRY_ID, []))
+    if device_ids := call.data.get(ATTR_DEVICE_ID):
+        registry = dr.async_get(hass)
+        for device_id in device_ids:
+            device = registry.async_get(device_id)
+            if device is None:
+                msg = f"Unknown device {device_id}"
+                raise ServiceValidationError(msg)
+            if not (panel_ids := device.config_entries & clients.keys()):
+                # Don't fall back to the default target for a wrong device.
+                msg = f"Device {device_id} is not a loaded Comfort panel"
+                raise ServiceValidationError(msg)
+            entry_ids.update(panel_ids)
+    if not entry_ids:
+        if default_all or len(clients) == 1:
+            return dict(clients)
+        msg = "Several Comfort panels are set up; choose a config entry or device"
+        raise ServiceValidationError(msg)
+    if missing := entry_ids - clients.keys():
+        msg = f"Comfort panel not loaded: {', '.join(sorted(missing))}"
+        raise ServiceValidationError(msg)
+    return {entry_id: clients[entry_id] for entry_id in entry_ids}
+
+
+def _command_result(command: str, result: ComfortMessage | ComfortError) -> dict:
+    """Return one command's reply, or its error, as service response data."""
+    if isinstance(result, Exception):
+        return {"command": command, "error": str(result)}
+    return {"command": command, "code": result.code, "reply": result.raw[1:]}
+
+
+async def _fan_out(clients: dict[str, TCPClient], calls: list) -> dict[str, object]:
+    """
+    Await one call per panel and return each result or ComfortError by entry id.
+
+    Every panel is tried even if another one fails; errors other than
+    ComfortError are still raised.
+    """
+    results = await asyncio.gather(*calls, return_exceptions=True)
+    for result in results:
+        if isinstance(result, BaseException) and not isinstance(result, ComfortError):
+            raise result
+    return dict(zip(clients, results, strict=True))
+
+
+def async_setup_services(hass: HomeAssistant) -> None:
+    """Register the integration's services."""
+
+    async def handle_send_message(call: ServiceCall) -> None:
+        """Send a raw message to each targeted panel at the same time."""
+        clients = target_clients(hass, call)
+        results = await _fan_out(
+            clients,
+            [client.send_message(call.data["message"]) for client in clients.values()],
+        )
+        if errors := {
+            entry_id: result
+            for entry_id, result in results.items()
+            if isinstance(result, ComfortError)
+        }:
+            msg = "; ".join(f"{entry_id}: {err}" for entry_id, err in errors.items())
+            raise HomeAssistantError(msg)
+
+    async def handle_send_commands(call: ServiceCall) -> ServiceResponse:
+        """Send a batch of commands in one burst and return every reply."""
+        clients = target_clients(hass, call)
+        commands = [command.strip().lstrip("\x03") for command in call.data["commands"]]
+        results = await _fan_out(
+            clients,
+            [
+                client.request_many(commands, call.data.get("timeout"))
+                for client in clients.values()
+            ],
+        )
+        return {
+            entry_id: {"error": str(panel_results)}
+            if isinstance(panel_results, ComfortError)
+            else [
+                _command_result(command, result)
+                for command, result in zip(commands, panel_results, strict=True)
+            ]
+            for entry_id, panel_results in results.items()
+        }
+
+    async def handle_set_outputs(call: ServiceCall) -> ServiceResponse:
+        """Switch many outputs in one burst and return every reply."""
+        clients = target_clients(hass, call)
+        states = call.data["outputs"]
+        results = await _fan_out(
+            clients, [client.set_outputs(states) for client in clients.values()]
+        )
+        return {
+            entry_id: {"error": str(panel_results)}
+            if isinstance(panel_results, ComfortError)
+            else [
+                _command_result(f"O!{output:02X}{int(state):02X}", result)
+                for (output, state), result in zip(
+                    states.items(), panel_results, strict=True
+                )
+            ]
+            for entry_id, panel_results in results.items()
+        }
+
+    async def handle_set_frame_logging(call: ServiceCall) -> None:
+        """Throttle or silence per-frame debug logging at runtime."""
+        interval = call.data["interval"] if call.data["enabled"] else None
+        codes = call.data.get("codes") or None
+        for client in target_clients(hass, call, default_all=True).values():
+            client.frame_log.set_interval(interval, codes)
+
+    async def handle_set_capture(call: ServiceCall) -> None:
+        """Start or stop capturing raw panel traffic to a file."""
+        clients = target_clients(hass, call, default_all=True)
+        await asyncio.gather(
+            *(
+                client.async_set_capture(
+                    hass.config.path(DOMAIN, f"{entry_id}.capture")
+                    if call.data["enabled"]
+                    else None,
+                    int(call.data["max_size"] * 1e6),
+                    call.data["backups"],
+                )
+                for entry_id, client in clients.items()
+            )
+        )
+
+    hass.services.async_register(
+        DOMAIN, "send_message", handle_send_message, schema=SEND_MESSAGE_SCHEMA
+    )
+    hass.services.async_register(
+        DOMAIN,
+        "send_commands",
+        handle_send_commands,
+        schema=SEND_COMMANDS_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        "set_outputs",
+        handle_set_outputs,
+        schema=SET_OUTPUTS_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        "set_frame_logging",
+        handle_set_frame_logging,
+        schema=SET_FRAME_LOGGING_SCHEMA,
+    )
+    hass.services.async_register(
+        DOMAIN, "set_capture", handle_set_capture, schema=SET_CAPTURE_SCHEMA
+    )
@@ -0,0 +1,74 @@
+from typing import Any  # noqa: D100
+
+from homeassistant.components.switch import SwitchEntity
+from homeassistant.core import callback
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
+
+from .const import DOMAIN, SIGNAL_OUTPUT, SIGNAL_OUTPUT_COUNT
+from .entity import ComfortEntity
+
+
+async def async_setup_entry(hass, entry, async_add_entities) -> None:  # noqa: ANN001
+    """Set up one switch per output."""
+    client = hass.data[DOMAIN][entry.entry_id]
+    switches: list[ComfortOutputSwitch] = []
+
+    # Like zones, outputs are added as the panel reports them.
+    @callback
+    def add_new_outputs() -> None:
+        new = [
+            ComfortOutputSwitch(client, output)
+            for output in range(len(switches) + 1, client.output_count + 1)
+        ]
+        if new:
+            switches.extend(new)
+            async_add_entities(new)
+
+    add_new_outputs()
+    entry.async_on_unload(
+        async_dispatcher_connect(
+            hass, SIGNAL_OUTPUT_COUNT.format(entry.entry_id), add_new_outputs
+        )
+    )
+
+
+class ComfortOutputSwitch(ComfortEntity, SwitchEntity):
+    """Switch for an output, shown optimistically until the panel confirms it."""
+
+    def __init__(self, client, output: int):  # noqa: ANN001, ANN204, D107
+        super().__init__(client)
+        self._output = output
+        self._attr_name = f"Output {output}"
+        self._attr_unique_id = f"{client.entry_id}_output_{output}"
+
+    async def async_added_to_hass(self) -> None:
+        """Take the current output state and follow changes to this output."""
+        await super().async_added_to_hass()
+        self._attr_is_on = self._client.output_state(self._output)
+        self.async_on_remove(
+            async_dispatcher_connect(
+                self.hass,
+                SIGNAL_OUTPUT.format(self._client.entry_id, self._output),
+                self.update_state,
+            )
+        )
+
+    @callback
+    def update_state(self, is_on: bool | None) -> None:  # noqa: FBT001
+        """Write the new state, whether requested, confirmed or reverted."""
+        if is_on != self._attr_is_on:
+            self._attr_is_on = is_on
+            self.async_write_ha_state()
+
+    async def async_turn_on(self, **kwargs: Any) -> None:  # noqa: ARG002
+        """Turn the output on."""
+        await self._set(state=True)
+
+    async def async_turn_off(self, **kwargs: Any) -> None:  # noqa: ARG002
+        """Turn the output off."""
+        await self._set(state=False)
+
+    async def _set(self, *, state: bool) -> None:
+        (result,) = await self._client.set_outputs({self._output: state})
+        if isinstance(result, Exception):
+            raise result
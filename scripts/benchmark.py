@@ -0,0 +1,158 @@
+# ruff: noqa: INP001
+"""
+End-to-end throughput and latency benchmark for the Comfort TCP client.
+
+Runs a fake panel and a TCPClient in one event loop, with a binary sensor
+per zone writing to a real state machine, and reports:
+
+- frames per second handled by the client,
+- time from a frame being written by the panel to async_write_ha_state,
+- memory growth over the run, sampled as it goes.
+
+    scripts/benchmark --rate 2000 --duration 60
+    scripts/benchmark --rate 1 --burst 500 --duration 600 --trace-memory
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import logging
+import os
+import statistics
+import tempfile
+import time
+import tracemalloc
+from collections import deque
+
+from fake_panel import add_arguments, from_arguments
+from homeassistant.core import HomeAssistant, callback
+
+from custom_components.comfort.binary_sensor import ComfortInputSensor
+from custom_components.comfort.client import TCPClient
+
+
+class BenchmarkSensor(ComfortInputSensor):
+    """Zone sensor that records when each state write happens."""
+
+    def __init__(self, client: TCPClient, zone: int, sent, latencies) -> None:  # noqa: ANN001
+        """Record latencies against the panel's send times."""
+        super().__init__(client, zone)
+        self.entity_id = f"binary_sensor.benchmark_input_{zone}"
+        self._sent = sent
+        self._latencies = latencies
+
+    @callback
+    def async_write_ha_state(self) -> None:
+        """Record the wire-to-write latency, then write to the state machine."""
+        now = time.perf_counter()
+        if self._sent:
+            self._latencies.append(now - self._sent.popleft())
+        # No entity platform here, so write the state directly.
+        self.hass.states.async_set(self.entity_id, "on" if self.is_on else "off")
+
+
+def _rss() -> int:
+    """Return the resident set size in bytes (Linux only)."""
+    with open("/proc/self/statm") as statm:  # noqa: PTH123
+        return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+
+
+def _memory(*, traced: bool) -> str:
+    rss = f"rss {_rss() / 1e6:.1f} MB"
+    if traced:
+        return f"{rss}, traced {tracemalloc.get_traced_memory()[0] / 1e6:.2f} MB"
+    return rss
+
+
+def _percentile(values: list[float], percent: float) -> float:
+    return values[min(len(values) - 1, int(len(values) * percent / 100))]
+
+
+async def run(args: argparse.Namespace) -> None:
+    """Run one benchmark and print the results."""
+    panel = from_arguments(args)
+    server = await panel.start()
+    port = server.sockets[0].getsockname()[1]
+
+    config_dir = tempfile.mkdtemp(prefix="comfort-benchmark-")
+    hass = HomeAssistant(config_dir)
+    client = TCPClient(hass, "127.0.0.1", port, args.pin, "benchmark")
+    client.start()
+    while client.zone_count < args.zones:  # noqa: ASYNC110
+        await asyncio.sleep(0.01)
+
+    latencies: list[float] = []
+    sent: deque[float] = deque()
+    panel.sent = sent
+    sensors = [
+        BenchmarkSensor(client, zone, sent, latencies)
+        for zone in range(1, client.zone_count + 1)
+    ]
+    for sensor in sensors:
+        sensor.hass = hass
+        await sensor.async_added_to_hass()
+
+    if args.trace_memory:
+        tracemalloc.start()
+    print(f"start: {_memory(traced=args.trace_memory)}")  # noqa: T201
+    panel.generating.set()
+    start = time.perf_counter()
+    frames_at_start = client.metrics.frames.total()
+    next_sample = start + args.sample
+    while (now := time.perf_counter()) < start + args.duration:
+        await asyncio.sleep(min(next_sample, start + args.duration) - now)
+        if time.perf_counter() >= next_sample:
+            next_sample += args.sample
+            frames = client.metrics.frames.total() - frames_at_start
+            print(  # noqa: T201
+                f"{time.perf_counter() - start:7.1f}s: {frames} frames, "
+                f"{len(sent)} in flight, {_memory(traced=args.trace_memory)}"
+            )
+    elapsed = time.perf_counter() - start
+    frames = client.metrics.frames.total() - frames_at_start
+    memory = _memory(traced=args.trace_memory)
+
+    await client.stop()
+    server.close()
+    await hass.async_stop(force=True)
+
+    latencies.sort()
+    print(f"end: {memory}")  # noqa: T201
+    print(  # noqa: T201
+        f"frames: {frames} received, {panel.frames_sent} generated, "
+        f"{frames / elapsed:.0f} frames/s over {elapsed:.1f}s"
+    )
+    if latencies:
+        print(  # noqa: T201
+            "wire to state write (ms): "
+            f"mean {statistics.fmean(latencies) * 1000:.3f}, "
+            f"p50 {_percentile(latencies, 50) * 1000:.3f}, "
+            f"p95 {_percentile(latencies, 95) * 1000:.3f}, "
+            f"p99 {_percentile(latencies, 99) * 1000:.3f}, "
+            f"max {latencies[-1] * 1000:.3f}"
+        )
+
+
+def main() -> None:
+    """Parse the command line and run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    add_arguments(parser)
+    parser.add_argument(
+        "--duration", type=float, default=30.0, help="seconds to generate changes"
+    )
+    parser.add_argument(
+        "--sample", type=float, default=10.0, help="seconds between memory samples"
+    )
+    parser.add_argument(
+        "--trace-memory",
+        action="store_true",
+        help="also report Python allocations with tracemalloc (slower)",
+    )
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.WARNING)
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,223 @@
+# ruff: noqa: INP001
+"""
+Simulated Comfort panel for exercising TCPClient without hardware.
+
+Speaks enough of the Comfort ASCII protocol for the integration to log in,
+take its state snapshot and control outputs, and generates zone input
+changes at a configurable rate, optionally with periodic bursts.
+
+    python scripts/fake_panel.py --port 1001 --rate 5 --burst 50 --burst-interval 30
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import logging
+import random
+import time
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections import deque
+
+_LOGGER = logging.getLogger("fake_panel")
+
+# Generated frames are flushed at most this often, so high rates are
+# written in batches rather than one sleep per frame.
+TICK = 0.01
+
+
+class FakePanel:
+    """A Comfort panel that replies to queries and toggles zone inputs."""
+
+    def __init__(  # noqa: PLR0913
+        self,
+        *,
+        pin: str = "1234",
+        zones: int = 16,
+        outputs: int = 16,
+        change_rate: float = 1.0,
+        burst_size: int = 0,
+        burst_interval: float = 10.0,
+        seed: int | None = None,
+    ) -> None:
+        """Set up the panel state; nothing is served until start()."""
+        self.pin = pin
+        self.zones = zones
+        self.outputs = outputs
+        self.change_rate = change_rate
+        self.burst_size = burst_size
+        self.burst_interval = burst_interval
+        self.zone_bits = 0
+        self.output_bits = 0
+        self.mode = 0
+        self.frames_sent = 0
+        # When set, the time each generated IP frame was written, oldest first.
+        self.sent: deque[float] | None = None
+        # Zone changes start once this is set, so a harness can attach first.
+        self.generating = asyncio.Event()
+        self._random = random.Random(seed)  # noqa: S311
+        self._writers: set[asyncio.StreamWriter] = set()
+        self._generator: asyncio.Task | None = None
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> asyncio.Server:
+        """Listen for connections and start generating zone changes."""
+        server = await asyncio.start_server(self._handle, host, port)
+        self._generator = asyncio.create_task(self._generate())
+        return server
+
+    async def _handle(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        """Serve one connection; zone changes are only sent once logged in."""
+        _LOGGER.info("Client connected from %s", writer.get_extra_info("peername"))
+        buffer = b""
+        try:
+            while data := await reader.read(4096):
+                buffer += data
+                *frames, buffer = buffer.split(b"\r")
+                replies = []
+                for frame in frames:
+                    command = frame.strip().lstrip(b"\x03").decode("ascii", "ignore")
+                    if command:
+                        replies.extend(self._reply(command, writer))
+                if replies:
+                    writer.write("".join(f"\x03{r}\r" for r in replies).encode())
+                    await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            self._writers.discard(writer)
+            writer.close()
+            _LOGGER.info("Client disconnected")
+
+    def _reply(self, command: str, writer: asyncio.StreamWriter) -> list[str]:  # noqa: PLR0911
+        """Return the reply frames for one command."""
+        code, data = command[:2], command[2:]
+        if code == "LI":
+            if data == self.pin:
+                self._writers.add(writer)
+                return ["LU01"]
+            self._writers.discard(writer)
+            return ["LU00"]
+        if writer not in self._writers and code != "cc":
+            return ["NA"]
+        if code == "cc":
+            return [command]
+        if code == "M?":
+            return [f"M?{self.mode:02X}"]
+        if code in ("m!", "M!"):
+            self.mode = int(data[:2], 16)
+            return [f"MD{self.mode:02X}01"]
+        if code == "Z?":
+            return ["Z?" + _hex_bits(self.zone_bits, self.zones)]
+        if code == "Y?":
+            return ["Y?" + _hex_bits(self.output_bits, self.outputs)]
+        if code == "O!":
+            output, state = int(data[:2], 16), int(data[2:4], 16)
+            bit = 1 << (output - 1)
+            self.output_bits = (
+                self.output_bits | bit if state else self.output_bits & ~bit
+            )
+            return ["OK", f"OP{output:02X}{state:02X}"]
+        if code == "C?":
+            return [f"C?{data[:2]}0000"]
+        if code == "s?":
+            return [f"s?{data[:2]}0000"]
+        if code == "f?":
+            return ["f?00" + "00" * 32]
+        return ["NA"]
+
+    def _change_zone(self) -> str:
+        """Toggle a random zone and return the IP frame reporting it."""
+        zone = self._random.randint(1, self.zones)
+        self.zone_bits ^= 1 << (zone - 1)
+        return f"\x03IP{zone:02X}{self.zone_bits >> (zone - 1) & 1:02X}\r"
+
+    async def _generate(self) -> None:
+        """Send zone changes at change_rate, plus a burst every burst_interval."""
+        await self.generating.wait()
+        last = time.monotonic()
+        due = 0.0
+        next_burst = last + self.burst_interval
+        while True:
+            await asyncio.sleep(TICK)
+            now = time.monotonic()
+            due += self.change_rate * (now - last)
+            last = now
+            count, due = int(due), due - int(due)
+            if self.burst_size and now >= next_burst:
+                count += self.burst_size
+                next_burst += self.burst_interval
+            if count and self._writers:
+                await self._broadcast([self._change_zone() for _ in range(count)])
+
+    async def _broadcast(self, frames: list[str]) -> None:
+        data = "".join(frames).encode()
+        for writer in list(self._writers):
+            writer.write(data)
+        if self.sent is not None:
+            self.sent.extend([time.perf_counter()] * len(frames))
+        self.frames_sent += len(frames)
+        for writer in list(self._writers):
+            try:
+                await writer.drain()
+            except ConnectionError:
+                self._writers.discard(writer)
+
+
+def _hex_bits(bits: int, count: int) -> str:
+    """Return a bitmask as Comfort hex bytes, item 1 first."""
+    return bits.to_bytes((count + 7) // 8, "little").hex().upper()
+
+
+def add_arguments(parser: argparse.ArgumentParser) -> None:
+    """Add the panel simulation options to a command line parser."""
+    parser.add_argument("--pin", default="1234", help="PIN accepted for login")
+    parser.add_argument("--zones", type=int, default=16, help="number of zones")
+    parser.add_argument("--outputs", type=int, default=16, help="number of outputs")
+    parser.add_argument(
+        "--rate", type=float, default=1.0, help="zone changes per second"
+    )
+    parser.add_argument(
+        "--burst", type=int, default=0, help="extra zone changes sent in one burst"
+    )
+    parser.add_argument(
+        "--burst-interval", type=float, default=10.0, help="seconds between bursts"
+    )
+    parser.add_argument("--seed", type=int, help="random seed for zone changes")
+
+
+def from_arguments(args: argparse.Namespace) -> FakePanel:
+    """Create a panel from parsed command line options."""
+    return FakePanel(
+        pin=args.pin,
+        zones=args.zones,
+        outputs=args.outputs,
+        change_rate=args.rate,
+        burst_size=args.burst,
+        burst_interval=args.burst_interval,
+        seed=args.seed,
+    )
+
+
+async def main() -> None:
+    """Serve a simulated panel until interrupted."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--host", default="127.0.0.1", help="address to listen on")
+    parser.add_argument("--port", type=int, default=1001, help="port to listen on")
+    add_arguments(parser)
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+
+    panel = from_arguments(args)
+    server = await panel.start(args.host, args.port)
+    panel.generating.set()
+    _LOGGER.info("Fake panel listening on %s:%s", args.host, args.port)
+    async with server:
+        await server.serve_forever()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,117 @@
+# ruff: noqa: INP001
+r"""
+Replay a traffic capture to a TCPClient as if it came from the panel.
+
+Serves the received side of a capture made with the comfort.set_capture
+service, keeping the original timing scaled by --speed (0 sends it as fast
+as the client reads). Logins and heartbeats from the client are answered
+locally; every other command is ignored.
+
+    scripts/replay --speed 10 \
+        config/comfort/<entry id>.capture.1 config/comfort/<entry id>.capture
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import logging
+import time
+
+from custom_components.comfort.capture import INBOUND, read_capture
+
+_LOGGER = logging.getLogger("replay")
+
+
+class Replay:
+    """Serve one capture to each client that logs in."""
+
+    def __init__(self, paths: list[str], speed: float, *, loop: bool) -> None:
+        """Load the received chunks of the given files, oldest file first."""
+        self.records = [
+            (timestamp, data)
+            for path in paths
+            for timestamp, direction, data in read_capture(path)
+            if direction == INBOUND
+        ]
+        self.speed = speed
+        self.loop = loop
+
+    async def handle(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        """Answer the login, then stream the capture until done or disconnected."""
+        logged_in = asyncio.Event()
+        answer = asyncio.create_task(self._answer(reader, writer, logged_in))
+        try:
+            await logged_in.wait()
+            while True:
+                await self._stream(writer)
+                if not self.loop:
+                    break
+            _LOGGER.info("Replay finished")
+            await answer
+        except ConnectionError:
+            pass
+        finally:
+            answer.cancel()
+            writer.close()
+
+    async def _answer(
+        self,
+        reader: asyncio.StreamReader,
+        writer: asyncio.StreamWriter,
+        logged_in: asyncio.Event,
+    ) -> None:
+        """Reply to login and heartbeat frames from the client."""
+        buffer = b""
+        while data := await reader.read(4096):
+            buffer += data
+            *frames, buffer = buffer.split(b"\r")
+            for frame in frames:
+                command = frame.strip().lstrip(b"\x03")
+                if command.startswith(b"LI"):
+                    writer.write(b"\x03LU01\r")
+                    logged_in.set()
+                elif command.startswith(b"cc"):
+                    writer.write(b"\x03" + command + b"\r")
+
+    async def _stream(self, writer: asyncio.StreamWriter) -> None:
+        """Write the capture once, spaced out as it was recorded."""
+        if not self.records:
+            return
+        first = self.records[0][0]
+        start = time.monotonic()
+        for timestamp, data in self.records:
+            if self.speed:
+                delay = (timestamp - first) / self.speed - (time.monotonic() - start)
+                if delay > 0:
+                    await asyncio.sleep(delay)
+            writer.write(data)
+            await writer.drain()
+
+
+async def main() -> None:
+    """Serve the capture until interrupted."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("paths", nargs="+", help="capture files, oldest first")
+    parser.add_argument("--host", default="127.0.0.1", help="address to listen on")
+    parser.add_argument("--port", type=int, default=1001, help="port to listen on")
+    parser.add_argument(
+        "--speed", type=float, default=1.0, help="replay speed (0 for no delays)"
+    )
+    parser.add_argument("--loop", action="store_true", help="repeat the capture")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+
+    replay = Replay(args.paths, args.speed, loop=args.loop)
+    _LOGGER.info(
+        "Replaying %d chunks on %s:%s", len(replay.records), args.host, args.port
+    )
+    server = await asyncio.start_server(replay.handle, args.host, args.port)
+    async with server:
+        await server.serve_forever()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())